@@ -17,6 +17,7 @@ from db.models import (
     PlayerTeamSeason,
     TeamGameStats,
     PlayerAward,
+    PlayerCareerHigh,
     IngestionCheckpoint
 )
 
@@ -36,6 +37,7 @@ from db.query import (
     get_historical_teammates,
     get_player_career_stats,
     get_player_career_highs,
+    get_career_highs_bulk,
     get_player_awards,
     # Nuevas funciones de temporadas y clasificaciones
     get_all_seasons,
@@ -47,6 +49,7 @@ from db.query import (
     # Nuevas funciones de ranking y agregación
     get_player_rankings,
     get_award_leaders,
+    run_parallel,
 )
 
 # Importar funciones de resumen
@@ -69,6 +72,7 @@ __all__ = [
     'PlayerTeamSeason',
     'TeamGameStats',
     'PlayerAward',
+    'PlayerCareerHigh',
     'IngestionCheckpoint',
     # Funciones de consulta
     'get_database_stats',
@@ -85,6 +89,7 @@ __all__ = [
     'get_historical_teammates',
     'get_player_career_stats',
     'get_player_career_highs',
+    'get_career_highs_bulk',
     'get_player_awards',
     'get_all_seasons',
     'get_season_standings',
@@ -93,6 +98,7 @@ __all__ = [
     'get_team_roster',
     'get_player_rankings',
     'get_award_leaders',
+    'run_parallel',
     # Funciones de resumen
 
     'get_record_counts',
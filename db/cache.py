@@ -0,0 +1,92 @@
+"""Caché en memoria con expiración (TTL) para funciones de consulta.
+
+Este módulo proporciona un decorador LRU con tiempo de vida para memoizar
+resultados de consultas de solo lectura a nivel de proceso.
+"""
+
+import copy
+import time
+import threading
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from db.connection import get_session, current_session
+
+
+def ttl_cache(maxsize: int = 128, ttl: float = 60, version: Optional[Callable[..., Any]] = None):
+    """Decorador LRU con expiración para funciones con parámetro `session`.
+
+    - Si el llamador pasa una sesión explícita, la caché se omite (evita servir
+      datos de otra transacción).
+    - Cada acierto devuelve una copia profunda, de modo que el llamador puede
+      mutar el resultado sin alterar la entrada cacheada.
+    - `version(session, *args, **kwargs)` permite añadir a la clave un valor barato
+      de calcular (ej: fecha del último partido) para autoinvalidar la entrada.
+
+    La caché es por proceso: las escrituras hechas desde otros procesos (ingesta) no
+    la invalidan, de modo que la frescura de los datos está acotada por `ttl`. La
+    función decorada expone `cache_clear()`, que vacía solo la del proceso actual.
+
+    Args:
+        maxsize: Número máximo de entradas (se descarta la menos usada)
+        ttl: Tiempo de vida de cada entrada en segundos
+        version: Callable opcional que recibe una sesión y los argumentos de la llamada
+    """
+    def decorator(func: Callable) -> Callable:
+        entries: OrderedDict = OrderedDict()
+        lock = threading.Lock()
+
+        def lookup(key):
+            with lock:
+                hit = entries.get(key)
+                if hit is None:
+                    return None
+                if hit[1] <= time.monotonic():
+                    del entries[key]
+                    return None
+                entries.move_to_end(key)
+                return hit
+
+        def store(key, value):
+            with lock:
+                entries[key] = (value, time.monotonic() + ttl)
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+
+        @functools.wraps(func)
+        def wrapper(*args, session=None, **kwargs):
+            if session is not None:
+                return func(*args, session=session, **kwargs)
+
+            key = (args, tuple(sorted(kwargs.items())))
+            if version is None:
+                hit = lookup(key)
+                if hit is not None:
+                    return copy.deepcopy(hit[0])
+                value = func(*args, **kwargs)
+            else:
+                # Sesión de la petición si hay una ligada; si no, una propia
+                shared = current_session()
+                own_session = shared if shared is not None else get_session()
+                try:
+                    key = key + (version(own_session, *args, **kwargs),)
+                    hit = lookup(key)
+                    if hit is not None:
+                        return copy.deepcopy(hit[0])
+                    value = func(*args, session=own_session, **kwargs)
+                finally:
+                    if shared is None:
+                        own_session.close()
+
+            store(key, value)
+            return copy.deepcopy(value)
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
@@ -3,12 +3,18 @@
 Este módulo maneja:
 - Configuración de la URL de conexión
 - Creación de sesiones SQLAlchemy
+- Sesión compartida por petición (contextvar)
 - Inicialización de la base de datos
 """
 
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -20,16 +26,43 @@ DATABASE_URL = os.getenv(
 )
 
 
+# Tamaño de la caché de SQL compilado del engine (por defecto 500 en SQLAlchemy);
+# las variantes de filtros de las consultas con lambda_stmt ocupan una entrada cada una
+QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", 1200))
+
+# Pool de conexiones (QueuePool): conexiones persistentes reutilizadas entre sesiones
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))          # Conexiones mantenidas abiertas
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 30))    # Conexiones extra en picos de concurrencia
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Segundos antes de renovar una conexión
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))    # Segundos de espera por una conexión libre
+# LIFO: se reutiliza la conexión devuelta más recientemente (caliente). En ráfagas
+# (ej: escritor de logs, peticiones web) no se rotan conexiones inactivas, y en
+# periodos tranquilos las del fondo del pool quedan ociosas y se reciclan
+POOL_USE_LIFO = os.getenv("DB_POOL_USE_LIFO", "true").lower() == "true"
+
+# Extensión pg_trgm (índice de búsqueda de jugadores por subcadena): opcional. Con
+# "false" init_db no intenta crearla
+ENABLE_PG_TRGM = os.getenv("DB_ENABLE_PG_TRGM", "true").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+
 # Singleton engine instance and the PID that created it
 _engine = None
 _engine_pid = None
 
+# Sesión ligada al contexto actual (petición web); las funciones de consulta la
+# reutilizan cuando no reciben `session`. No se propaga a hilos de ThreadPoolExecutor
+_current_session: ContextVar[Optional[Session]] = ContextVar('nba_session', default=None)
+
 
 def get_engine():
     """Crea y retorna un engine de SQLAlchemy (Singleton per process).
     
     Detecta si el proceso ha cambiado (fork) y recrea el engine para evitar
-    conflictos con el pool de conexiones del proceso padre.
+    conflictos con el pool de conexiones del proceso padre. El pool verifica cada
+    conexión antes de usarla (pool_pre_ping), la renueva tras POOL_RECYCLE segundos
+    y entrega primero la usada más recientemente (pool_use_lifo).
     
     Returns:
         Engine: Engine de SQLAlchemy configurado
@@ -39,8 +72,19 @@ def get_engine():
     
     if _engine is None or _engine_pid != current_pid:
         if _engine is not None:
-            _engine.dispose()
-        _engine = create_engine(DATABASE_URL)
+            # close=False: las conexiones heredadas pertenecen al proceso padre;
+            # se descartan del pool sin cerrarlas para no cortar las suyas
+            _engine.dispose(close=False)
+        _engine = create_engine(
+            DATABASE_URL,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+            pool_pre_ping=True,
+            pool_recycle=POOL_RECYCLE,
+            pool_use_lifo=POOL_USE_LIFO,
+            query_cache_size=QUERY_CACHE_SIZE,
+        )
         _engine_pid = current_pid
         
     return _engine
@@ -57,6 +101,37 @@ def get_session():
     return Session()
 
 
+def current_session() -> Optional[Session]:
+    """Retorna la sesión ligada al contexto actual por `session_scope`, si existe."""
+    return _current_session.get()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Liga una sesión al contexto actual durante el bloque `with`.
+    
+    Las funciones de consulta llamadas sin `session` dentro del bloque reutilizan
+    esta sesión en lugar de abrir y cerrar una propia, de modo que una petición
+    que encadena varias consultas usa una única sesión. Si ya hay una sesión
+    ligada, se reutiliza y no se cierra al salir.
+    
+    Yields:
+        Session: Sesión ligada al contexto
+    """
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+    
+    session = get_session()
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+        session.close()
+
+
 def init_db():
     """Inicializa la base de datos creando todas las tablas definidas en los modelos.
     
@@ -70,4 +145,21 @@ def init_db():
     except ImportError:
         pass  # outliers module may not be available
     engine = get_engine()
+    _create_pg_trgm_extension(engine)
     Base.metadata.create_all(engine)
+
+
+def _create_pg_trgm_extension(engine) -> None:
+    """Crea la extensión pg_trgm si está habilitada (ENABLE_PG_TRGM) y es posible.
+    
+    Se ejecuta en su propia transacción: si el servidor no la ofrece o el rol no
+    puede crear extensiones, se avisa y create_all continúa sin el índice trigram
+    (la búsqueda ILIKE funciona igual, sin índice).
+    """
+    if not ENABLE_PG_TRGM or engine.dialect.name != 'postgresql':
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    except DBAPIError as e:
+        logger.warning(f"No se pudo crear la extensión pg_trgm; se omite idx_players_name_trgm: {e}")
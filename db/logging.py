@@ -5,12 +5,17 @@ para todos los componentes del sistema (CLI, Workers, Web).
 """
 import os
 import sys
+import copy
+import time
+import queue
+import atexit
 import logging
 import traceback
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timezone
 from typing import Optional, Dict
 
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
 from sqlalchemy import delete
 
 from db.connection import get_engine, get_session
@@ -35,6 +40,11 @@ WORKER_LOG_LEVEL_DB = "INFO"
 PROGRESS_UPDATE_EVERY_N_ITEMS = int(os.getenv("INGEST_PROGRESS_UPDATE_ITEMS", 1))
 PROGRESS_LOG_EVERY_N_SECONDS = int(os.getenv("INGEST_PROGRESS_LOG_INTERVAL", 5))
 
+# Escritura de logs en BD por lotes: máximo de filas por INSERT y segundos máximos
+# que un registro espera en un lote incompleto antes de volcarse
+LOG_DB_BATCH_SIZE = int(os.getenv("LOG_DB_BATCH_SIZE", 500))
+LOG_DB_FLUSH_INTERVAL = float(os.getenv("LOG_DB_FLUSH_INTERVAL", 1.0))
+
 # Configuración de Limpieza
 CLEAR_LOGS_ON_INGESTION_START = os.getenv("INGEST_CLEAR_LOGS", "true").lower() == "true"
 
@@ -43,43 +53,140 @@ CLEAR_LOGS_ON_INGESTION_START = os.getenv("INGEST_CLEAR_LOGS", "true").lower() =
 # 2. HANDLERS PERSONALIZADOS
 # ==============================================================================
 
+_LOG_ENTRIES_INSERT = LogEntry.__table__.insert()
+
+
 class SQLAlchemyHandler(logging.Handler):
-    """Handler que guarda registros en la tabla log_entries de la base de datos."""
+    """Handler que guarda registros en la tabla log_entries de la base de datos.
+    
+    Acumula los registros y los inserta por lotes (hasta LOG_DB_BATCH_SIZE filas)
+    con un único INSERT Core multi-fila y un COMMIT por lote. setup_logging lo
+    ejecuta en el hilo de un QueueListener, que además llama a flush() cuando vence
+    `flush_deadline`: LOG_DB_FLUSH_INTERVAL segundos desde el primer registro del
+    lote, haya o no actividad en la cola.
+    """
     
     def __init__(self, level=logging.NOTSET):
         super().__init__(level=level)
-        self._session_factory = None
-
-    @property
-    def session_factory(self):
-        if self._session_factory is None:
-            engine = get_engine()
-            self._session_factory = sessionmaker(bind=engine)
-        return self._session_factory
+        self._buffer = []
+        # Instante (time.monotonic) en que debe volcarse el lote; None si está vacío
+        self.flush_deadline: Optional[float] = None
 
     def emit(self, record):
         if record.name.startswith('sqlalchemy') or record.name.startswith('psycopg'):
             return
 
-        session = self.session_factory()
+        if not self._buffer:
+            self.flush_deadline = time.monotonic() + LOG_DB_FLUSH_INTERVAL
+        self._buffer.append(record)
+        if len(self._buffer) >= LOG_DB_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Inserta los registros acumulados."""
+        self.acquire()
         try:
-            tb = None
-            if record.exc_info:
-                tb = "".join(traceback.format_exception(*record.exc_info))
-            
-            log_entry = LogEntry(
-                timestamp=datetime.fromtimestamp(record.created, tz=timezone.utc),
-                level=record.levelname,
-                module=record.name,
-                message=record.getMessage(),
-                traceback=tb
-            )
-            session.add(log_entry)
-            session.commit()
-        except Exception:
-            session.rollback()
+            records, self._buffer = self._buffer, []
+            self.flush_deadline = None
+            if records:
+                self._write(records)
         finally:
-            session.close()
+            self.release()
+
+    def _write(self, records):
+        # INSERT Core (executemany) en su propia transacción: sin Session ni ORM
+        try:
+            rows = []
+            for record in records:
+                # Los registros que llegan por _DBQueueHandler traen el traceback ya
+                # formateado en exc_text
+                tb = record.exc_text
+                if record.exc_info:
+                    tb = "".join(traceback.format_exception(*record.exc_info))
+                rows.append({
+                    'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc),
+                    'level': record.levelname,
+                    'module': record.name,
+                    'message': record.getMessage(),
+                    'traceback': tb,
+                })
+            with get_engine().begin() as conn:
+                conn.execute(_LOG_ENTRIES_INSERT, rows)
+        except Exception:
+            # Como los handlers de la stdlib: el fallo se informa por stderr
+            # (ligado al último registro del lote) en lugar de perderse en silencio
+            self.handleError(records[-1])
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+class _DBQueueHandler(QueueHandler):
+    """QueueHandler que conserva el traceback para la columna de la BD.
+    
+    QueueHandler.prepare incrustaría el traceback en el mensaje; aquí el mensaje se
+    resuelve sin él y el traceback viaja formateado en exc_text.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
+
+
+class _BatchingQueueListener(QueueListener):
+    """QueueListener que vuelca cada lote al vencer su plazo (ver SQLAlchemyHandler).
+    
+    La espera en la cola se limita al plazo más próximo, de modo que un goteo
+    constante de registros no retrasa indefinidamente un lote incompleto.
+    """
+
+    def dequeue(self, block):
+        if not block:
+            return self.queue.get_nowait()
+        while True:
+            now = time.monotonic()
+            deadlines = []
+            for handler in self.handlers:
+                deadline = handler.flush_deadline
+                if deadline is not None and deadline <= now:
+                    handler.flush()
+                elif deadline is not None:
+                    deadlines.append(deadline)
+            # Sin lotes pendientes se espera sin límite (stop() encola un centinela)
+            timeout = min(deadlines) - now if deadlines else None
+            try:
+                return self.queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+
+
+# Listener activo del handler de BD y PID que lo arrancó (los procesos hijos
+# creados con fork no heredan su hilo)
+_db_listener: Optional[QueueListener] = None
+_db_listener_pid: Optional[int] = None
+
+
+def stop_db_logging():
+    """Para el listener de BD del proceso y vuelca sus registros pendientes.
+    
+    Se ejecuta con atexit, pero los procesos que terminan con os._exit (workers de
+    multiprocessing) deben llamarla explícitamente antes de salir.
+    """
+    global _db_listener
+    if _db_listener is not None and _db_listener_pid == os.getpid():
+        _db_listener.stop()
+        for handler in _db_listener.handlers:
+            handler.close()
+    _db_listener = None
+
+
+atexit.register(stop_db_logging)
 
 
 # ==============================================================================
@@ -111,8 +218,18 @@ def setup_logging(context: str = "cli", verbose: bool = False):
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
 
+    # El handler de BD corre en el hilo de un QueueListener: en el hilo de la
+    # aplicación registrar un mensaje es solo encolarlo
+    global _db_listener, _db_listener_pid
+    stop_db_logging()
+    _db_listener = _BatchingQueueListener(queue.Queue(-1), db_handler, respect_handler_level=True)
+    _db_listener_pid = os.getpid()
+    _db_listener.start()
+    db_queue_handler = _DBQueueHandler(_db_listener.queue)
+    db_queue_handler.setLevel(db_handler.level)
+
     root_logger.setLevel(logging.DEBUG) # El root acepta todo, los handlers filtran
-    root_logger.addHandler(db_handler)
+    root_logger.addHandler(db_queue_handler)
     root_logger.addHandler(console_handler)
     
     # 3. Ajustes finos de librerías ruidosas
@@ -6,16 +6,29 @@ import logging
 import sys
 from typing import Optional
 
-from sqlalchemy import or_, text
+from sqlalchemy import func, or_, select, text
 from db import get_session, get_engine
 from db.models import (
     Game, PlayerGameStats, PlayerTeamSeason, TeamGameStats, PlayerAward,
-    Player, AnomalyScore
+    PlayerCareerHigh, Player
+)
+from outliers.models import (
+    LeagueOutlier, PlayerOutlier, PlayerTrendOutlier, PlayerSeasonState,
+    StreakRecord, StreakAllTimeRecord
 )
-from outliers.models import LeagueOutlier, PlayerOutlier, StreakRecord
 
 logger = logging.getLogger(__name__)
 
+
+def _count_rows(session, models) -> dict:
+    """Cuenta las filas de varias tablas en una sola consulta (un count(*) escalar por tabla)."""
+    stmt = select(*[
+        select(func.count()).select_from(model).scalar_subquery().label(model.__tablename__)
+        for model in models
+    ])
+    return dict(session.execute(stmt).one()._mapping)
+
+
 class DatabaseMaintenance:
     """Clase para operaciones de mantenimiento de la base de datos."""
 
@@ -36,17 +49,31 @@ class DatabaseMaintenance:
                 (PlayerOutlier, "outliers de jugador"),
                 (StreakRecord, "rachas"),
                 (PlayerAward, "premios de jugadores"),
+                (PlayerCareerHigh, "récords de carrera"),
                 (TeamGameStats, "estadísticas de equipos"),
                 (PlayerTeamSeason, "relaciones jugador-equipo"),
                 (PlayerGameStats, "estadísticas de jugadores"),
                 (Game, "partidos"),
             ]
             
-            for model, desc in cleanup_steps:
-                logger.info(f"Eliminando {desc}...")
-                deleted = session.query(model).delete()
-                session.commit()
-                logger.info(f"   Eliminados {deleted} registros")
+            if session.get_bind().dialect.name == 'postgresql':
+                # TRUNCATE no informa de filas borradas: se cuentan antes, todas las
+                # tablas en una sola consulta
+                counts = _count_rows(session, [model for model, _ in cleanup_steps])
+                # Un único TRUNCATE en una transacción en lugar de un DELETE y un
+                # COMMIT por tabla. CASCADE vacía también las tablas derivadas que
+                # referencian partidos (ej: récords históricos de rachas)
+                tables = ", ".join(model.__tablename__ for model, _ in cleanup_steps)
+                session.execute(text(f"TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE"))
+                for model, desc in cleanup_steps:
+                    logger.info(f"Eliminando {desc}...")
+                    logger.info(f"   Eliminados {counts[model.__tablename__]} registros")
+            else:
+                for model, desc in cleanup_steps:
+                    logger.info(f"Eliminando {desc}...")
+                    deleted = session.execute(model.__table__.delete()).rowcount
+                    logger.info(f"   Eliminados {deleted} registros")
+            session.commit()
             
             logger.info("=" * 80)
             logger.info("BASE DE DATOS LIMPIADA CORRECTAMENTE")
@@ -69,20 +96,38 @@ class DatabaseMaintenance:
             logger.info("LIMPIANDO TABLA DE JUGADORES")
             logger.info("=" * 80)
             
-            # Limpieza en cascada manual
+            # Tablas que referencian jugadores, en orden de dependencia (hijo -> padre)
             cleanup_steps = [
-                (AnomalyScore, "estadísticas de anomalías"),
+                (LeagueOutlier, "outliers de liga"),
+                (PlayerOutlier, "outliers de jugador"),
+                (PlayerTrendOutlier, "tendencias de jugador"),
+                (PlayerSeasonState, "estado de temporada de jugadores"),
+                (StreakRecord, "rachas"),
+                (StreakAllTimeRecord, "récords históricos de rachas"),
                 (PlayerAward, "premios de jugadores"),
+                (PlayerCareerHigh, "récords de carrera"),
                 (PlayerTeamSeason, "relaciones jugador-equipo"),
                 (PlayerGameStats, "estadísticas de jugadores"),
                 (Player, "jugadores"),
             ]
 
-            for model, desc in cleanup_steps:
-                logger.info(f"Eliminando {desc}...")
-                deleted = session.query(model).delete()
-                session.commit()
-                logger.info(f"   Eliminados {deleted} registros")
+            if session.get_bind().dialect.name == 'postgresql':
+                # TRUNCATE no informa de filas borradas: se cuentan antes, todas las
+                # tablas en una sola consulta
+                counts = _count_rows(session, [model for model, _ in cleanup_steps])
+                # Un único TRUNCATE en una transacción en lugar de un DELETE y un
+                # COMMIT por tabla
+                tables = ", ".join(model.__tablename__ for model, _ in cleanup_steps)
+                session.execute(text(f"TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE"))
+                for model, desc in cleanup_steps:
+                    logger.info(f"Eliminando {desc}...")
+                    logger.info(f"   Eliminados {counts[model.__tablename__]} registros")
+            else:
+                for model, desc in cleanup_steps:
+                    logger.info(f"Eliminando {desc}...")
+                    deleted = session.execute(model.__table__.delete()).rowcount
+                    logger.info(f"   Eliminados {deleted} registros")
+            session.commit()
             
             logger.info("=" * 80)
             logger.info("TABLA DE JUGADORES LIMPIADA CORRECTAMENTE")
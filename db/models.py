@@ -4,7 +4,7 @@ Este módulo define todos los modelos de datos (ORM) que representan
 las tablas en la base de datos PostgreSQL.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Interval, Boolean, DateTime, UniqueConstraint, Index, CheckConstraint
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Interval, Boolean, DateTime, UniqueConstraint, Index, CheckConstraint, func, literal_column, text
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.dialects.postgresql import JSON
 from datetime import datetime, timezone
@@ -12,6 +12,15 @@ from datetime import datetime, timezone
 Base = declarative_base()
 
 
+def _pg_trgm_installed(ddl, target, bind, **kw) -> bool:
+    """Indica si la extensión pg_trgm está instalada en la BD (ver idx_players_name_trgm).
+    
+    init_db intenta crearla; si el servidor no la ofrece o el rol no tiene permisos
+    (habitual en BD gestionadas), el índice trigram se omite.
+    """
+    return bind.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+
+
 def utc_now():
     """Retorna la fecha y hora actual en UTC (timezone-aware).
     
@@ -112,8 +121,19 @@ class Player(Base):
         CheckConstraint('weight > 0', name='check_weight_positive'),
         CheckConstraint('season_exp >= 0', name='check_exp_positive'),
         Index('idx_players_name', 'full_name'),
+        # GIN trigram: acelera la búsqueda por subcadena (ILIKE '%nombre%') de get_players
+        Index('idx_players_name_trgm', 'full_name',
+              postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'})
+            .ddl_if(dialect='postgresql', callable_=_pg_trgm_installed),
         Index('idx_players_position', 'position'),
         Index('idx_players_award_sync_active', 'last_award_sync', 'is_active'),
+        # Rankings de jugadores activos (get_player_rankings): el Top-K se lee en orden
+        # del índice y se corta en el LIMIT, sin ordenar la tabla
+        Index('idx_players_active_birthdate', 'birthdate', postgresql_where=(is_active == True)),
+        Index('idx_players_active_weight', 'weight', postgresql_where=(is_active == True)),
+        Index('idx_players_active_season_exp', 'season_exp', postgresql_where=(is_active == True)),
+        Index('idx_players_active_draft', 'draft_number', draft_year.desc(),
+              postgresql_where=(is_active == True)),
     )
     
     def __repr__(self):
@@ -179,7 +199,21 @@ class Game(Base):
         CheckConstraint('home_score >= 0', name='check_home_score'),
         CheckConstraint('away_score >= 0', name='check_away_score'),
         Index('idx_games_season_date', 'season', 'date'),
+        # Parcial para el filtro dominante de clasificaciones y récords (fase regular finalizada)
+        Index('idx_games_rs_season_status_date', 'season', 'status', date.desc(), postgresql_where=(rs == True)),
+        # Cubriente para la agregación de clasificaciones (get_season_standings, get_team_record):
+        # equipos y ganador salen del índice (index-only scan) sin leer el heap de games
+        Index('idx_games_rs_season_status_teams', 'season', 'status',
+              postgresql_include=['home_team_id', 'away_team_id', 'winner_team_id'],
+              postgresql_where=(rs == True)),
         Index('idx_games_teams', 'home_team_id', 'away_team_id'),
+        # Índice funcional para búsquedas/orden por puntos totales (search_games_by_score)
+        Index('idx_games_total_score', home_score + away_score, postgresql_where=(status == 3)),
+        # Parcial sobre el número de partido (5 últimos dígitos del ID) de la NBA Cup:
+        # sirve el filtro de cuartos/semifinales de get_nba_cup_bracket. La expresión debe
+        # coincidir literalmente con la de la consulta (longitud como literal)
+        Index('idx_games_ist_season_number', 'season', func.right(id, literal_column('5')),
+              postgresql_where=(ist == True)).ddl_if(dialect='postgresql'),
     )
     
     def __repr__(self):
@@ -279,6 +313,30 @@ class PlayerGameStats(Base):
         # Índices compuestos para consultas comunes
         Index('idx_player_game_stats_player_season', 'player_id', 'game_id'),
         Index('idx_player_game_stats_team_game', 'team_id', 'game_id'),
+        
+        # Índices parciales para los conteos de hitos de carrera (get_player_career_highs):
+        # solo contienen las filas que superan el umbral, así el conteo es index-only
+        Index('idx_pgs_player_pts40', 'player_id', postgresql_where=(pts >= 40)),
+        Index('idx_pgs_player_pts50', 'player_id', postgresql_where=(pts >= 50)),
+        Index('idx_pgs_player_pts60', 'player_id', postgresql_where=(pts >= 60)),
+        Index('idx_pgs_player_reb20', 'player_id', postgresql_where=(reb >= 20)),
+        Index('idx_pgs_player_ast20', 'player_id', postgresql_where=(ast >= 20)),
+        Index('idx_pgs_player_stl5', 'player_id', postgresql_where=(stl >= 5)),
+        Index('idx_pgs_player_blk5', 'player_id', postgresql_where=(blk >= 5)),
+        Index('idx_pgs_player_fg3m10', 'player_id', postgresql_where=(fg3m >= 10)),
+        
+        # Índices (jugador, estadística DESC) para los máximos de carrera: max() y la
+        # búsqueda posterior del partido se resuelven recorriendo el índice
+        Index('idx_pgs_player_pts', 'player_id', pts.desc()),
+        Index('idx_pgs_player_reb', 'player_id', reb.desc()),
+        Index('idx_pgs_player_ast', 'player_id', ast.desc()),
+        Index('idx_pgs_player_stl', 'player_id', stl.desc()),
+        Index('idx_pgs_player_blk', 'player_id', blk.desc()),
+        Index('idx_pgs_player_fg3m', 'player_id', fg3m.desc()),
+        Index('idx_pgs_player_fgm', 'player_id', fgm.desc()),
+        Index('idx_pgs_player_ftm', 'player_id', ftm.desc()),
+        Index('idx_pgs_player_min', 'player_id', min.desc()),
+        Index('idx_pgs_player_plus_minus', 'player_id', plus_minus.desc()),
     )
     
     def __repr__(self):
@@ -365,6 +423,8 @@ class PlayerTeamSeason(Base):
         # Un jugador puede estar en múltiples equipos por temporada (trades)
         CheckConstraint('games_played >= 0', name='check_games_played'),
         Index('idx_player_season', 'player_id', 'season'),
+        # Última temporada/equipo de un jugador (get_current_teammates)
+        Index('idx_pts_player_season_end', 'player_id', season.desc(), end_date.desc()),
         Index('idx_team_season', 'team_id', 'season'),
         # Índice compuesto para optimizar consultas por (player_id, team_id, season)
         Index('idx_player_team_season', 'player_id', 'team_id', 'season'),
@@ -455,6 +515,59 @@ class TeamGameStats(Base):
         return f"<TeamGameStats(game_id='{self.game_id}', team_id={self.team_id}, pts={self.total_pts})>"
 
 
+
+class PlayerCareerHigh(Base):
+    """Récords de carrera precalculados de un jugador (tabla derivada).
+    
+    Se regenera junto al resto de tablas derivadas tras la ingesta, de modo que
+    get_player_career_highs resuelve la consulta con una búsqueda por clave primaria
+    en lugar de agregar todos los partidos del jugador.
+    """
+    __tablename__ = 'player_career_highs'
+    
+    player_id = Column(Integer, ForeignKey('players.id'), primary_key=True)
+    total_games = Column(Integer, default=0, nullable=False)
+    
+    # Máximos de carrera y partido (más reciente) en que se lograron
+    pts = Column(Integer, nullable=True)
+    pts_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    reb = Column(Integer, nullable=True)
+    reb_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    ast = Column(Integer, nullable=True)
+    ast_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    stl = Column(Integer, nullable=True)
+    stl_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    blk = Column(Integer, nullable=True)
+    blk_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    fg3m = Column(Integer, nullable=True)
+    fg3m_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    fgm = Column(Integer, nullable=True)
+    fgm_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    ftm = Column(Integer, nullable=True)
+    ftm_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    min = Column(Float, nullable=True, comment='Minutos')
+    min_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    plus_minus = Column(Float, nullable=True)
+    plus_minus_game_id = Column(String(15), ForeignKey('games.id'), nullable=True)
+    
+    # Conteos de hitos
+    double_doubles = Column(Integer, default=0, nullable=False)
+    triple_doubles = Column(Integer, default=0, nullable=False)
+    games_40_pts = Column(Integer, default=0, nullable=False)
+    games_50_pts = Column(Integer, default=0, nullable=False)
+    games_60_pts = Column(Integer, default=0, nullable=False)
+    games_20_reb = Column(Integer, default=0, nullable=False)
+    games_20_ast = Column(Integer, default=0, nullable=False)
+    games_5_stl = Column(Integer, default=0, nullable=False)
+    games_5_blk = Column(Integer, default=0, nullable=False)
+    games_10_3pm = Column(Integer, default=0, nullable=False)
+    
+    # Auditoría
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
+    
+    def __repr__(self):
+        return f"<PlayerCareerHigh(player_id={self.player_id}, pts={self.pts}, games={self.total_games})>"
+
 class PlayerAward(Base):
     """Modelo para premios y reconocimientos de jugadores."""
     __tablename__ = 'player_awards'
@@ -476,6 +589,9 @@ class PlayerAward(Base):
         # Un jugador puede tener múltiples premios en la misma temporada (ej: MVP y Champion)
         # Pero evitamos duplicados exactos
         UniqueConstraint('player_id', 'season', 'award_type', 'award_name', 'description', name='uq_player_award'),
+        
+        # Premios de un jugador ya ordenados por tipo y nombre (get_player_awards)
+        Index('idx_player_awards_player_type_name', 'player_id', 'award_type', 'award_name', season.desc()),
     )
     
     def __repr__(self):
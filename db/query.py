@@ -2,32 +2,72 @@
 
 Este módulo proporciona funciones de alto nivel para consultar datos
 de manera fácil y eficiente.
+
+Las funciones memoizadas con `ttl_cache` cachean por proceso (web, MCP). La
+ingesta escribe desde otros procesos y no puede vaciar esas cachés: tras una
+ingesta, los datos servidos van con retraso como mucho el `ttl` de cada
+función (cinco minutos como máximo).
 """
 
-import sys
+import heapq
 import math
-from pathlib import Path
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, groupby
+from operator import attrgetter, itemgetter
 from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any, Union
-from sqlalchemy import func, desc, asc, and_, or_, case
-from sqlalchemy.orm import Session, joinedload
-
-# Agregar el directorio raíz al PYTHONPATH
-current_dir = Path(__file__).resolve().parent
-project_root = current_dir.parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+from typing import Optional, List, Dict, Any, Union, Callable, Tuple
+import numpy as np
+from sqlalchemy import (
+    func, desc, asc, and_, or_, case, cast, inspect, select, union_all,
+    lambda_stmt, literal, literal_column, bindparam, table, column,
+    Integer, BigInteger, Float, String
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload, contains_eager, load_only
+from sqlalchemy.sql.functions import FunctionElement
 
-from db.connection import get_session
+from db.connection import get_session, current_session
+from db.cache import ttl_cache
 from db.models import (
     Team, Player, Game, PlayerGameStats, TeamGameStats,
-    PlayerTeamSeason, PlayerAward
+    PlayerTeamSeason, PlayerAward, PlayerCareerHigh
 )
 
 
+def run_parallel(calls: Dict[str, Callable[[], Any]], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Ejecuta consultas independientes en paralelo y devuelve sus resultados por clave.
+    
+    Cada llamada debe invocar una función de consulta sin `session`: abre la suya
+    (los hilos del pool no heredan la sesión ligada por `session_scope`, que no es
+    thread-safe) con una conexión distinta del pool (y aprovecha las cachés TTL), de modo que
+    las latencias de red se solapan en lugar de sumarse. Solo es adecuado para
+    funciones que devuelven dicts/listas, no objetos ORM con relaciones perezosas.
+    
+    Args:
+        calls: Dict clave -> callable sin argumentos (ej: functools.partial)
+        max_workers: Hilos máximos (por defecto, uno por llamada)
+        
+    Returns:
+        Dict clave -> resultado de la llamada
+    """
+    if not calls:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(calls)) as executor:
+        futures = {key: executor.submit(fn) for key, fn in calls.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+@ttl_cache(maxsize=2048, ttl=300)
 def get_current_teammates(player_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
-    """Obtiene compañeros del equipo actual (última temporada/equipo registrada)."""
+    """Obtiene compañeros del equipo actual (última temporada/equipo registrada).
+    
+    Sin sesión explícita el resultado se cachea cinco minutos por jugador.
+    """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
@@ -68,45 +108,49 @@ def get_current_teammates(player_id: int, session: Optional[Session] = None) ->
 def get_historical_teammates(player_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
     """Obtiene todos los compañeros históricos del jugador."""
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
         
     try:
-        player_seasons = session.query(PlayerTeamSeason).filter(PlayerTeamSeason.player_id == player_id).all()
-        if not player_seasons: 
+        # Una sola consulta: autojoin con las (equipo, temporada) del jugador
+        own_seasons = aliased(PlayerTeamSeason)
+        compañeros = session.query(PlayerTeamSeason)\
+            .join(own_seasons, and_(
+                own_seasons.team_id == PlayerTeamSeason.team_id,
+                own_seasons.season == PlayerTeamSeason.season
+            ))\
+            .options(joinedload(PlayerTeamSeason.player), joinedload(PlayerTeamSeason.team))\
+            .filter(
+                own_seasons.player_id == player_id,
+                PlayerTeamSeason.player_id != player_id
+            ).all()
+        if not compañeros: 
             return []
             
         teammates_data = {}
-        for ps in player_seasons:
-            compañeros = session.query(PlayerTeamSeason)\
-                .options(joinedload(PlayerTeamSeason.player), joinedload(PlayerTeamSeason.team))\
-                .filter(
-                    PlayerTeamSeason.team_id == ps.team_id,
-                    PlayerTeamSeason.season == ps.season,
-                    PlayerTeamSeason.player_id != player_id
-                ).all()
-                
-            for ts in compañeros:
-                if not ts.player: 
-                    continue
-                p_id = ts.player.id
-                if p_id not in teammates_data:
-                    teammates_data[p_id] = {
-                        'id': p_id, 
-                        'full_name': ts.player.full_name, 
-                        'position': ts.player.position,
-                        'seasons_together': set(), 
-                        'teams_together': {},
-                    }
-                d = teammates_data[p_id]
-                d['seasons_together'].add(ts.season)
-                if ts.team_id not in d['teams_together']:
-                    d['teams_together'][ts.team_id] = {
-                        'id': ts.team_id, 
-                        'name': ts.team.full_name, 
-                        'abbreviation': ts.team.abbreviation
-                    }
+        for ts in compañeros:
+            if not ts.player: 
+                continue
+            p_id = ts.player.id
+            if p_id not in teammates_data:
+                teammates_data[p_id] = {
+                    'id': p_id, 
+                    'full_name': ts.player.full_name, 
+                    'position': ts.player.position,
+                    'seasons_together': set(), 
+                    'teams_together': {},
+                }
+            d = teammates_data[p_id]
+            d['seasons_together'].add(ts.season)
+            if ts.team_id not in d['teams_together']:
+                d['teams_together'][ts.team_id] = {
+                    'id': ts.team_id, 
+                    'name': ts.team.full_name, 
+                    'abbreviation': ts.team.abbreviation
+                }
         
         result = []
         for tid, data in teammates_data.items():
@@ -124,36 +168,52 @@ def get_historical_teammates(player_id: int, session: Optional[Session] = None)
             session.close()
 
 
-def get_database_stats(session: Optional[Session] = None) -> Dict[str, int]:
+_DATABASE_STATS_MODELS = {
+    'teams': Team,
+    'players': Player,
+    'games': Game,
+    'player_game_stats': PlayerGameStats,
+    'team_game_stats': TeamGameStats,
+    'player_team_seasons': PlayerTeamSeason,
+    'player_awards': PlayerAward,
+}
+
+
+def get_database_stats(approximate: bool = False, session: Optional[Session] = None) -> Dict[str, int]:
     """Retorna estadísticas generales de la base de datos.
     
-    Optimizado para realizar una única consulta a la base de datos.
+    Los conteos exactos se obtienen en una única consulta UNION ALL (un SELECT
+    count(*) por tabla). Con approximate=True en PostgreSQL se leen las
+    estimaciones de pg_class.reltuples, sin recorrer las tablas; si alguna tabla
+    aún no tiene estadísticas (reltuples < 0) se cae al conteo exacto.
     """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        # Usamos subconsultas para obtener todos los conteos en un solo viaje a la BD
-        stats = session.query(
-            session.query(func.count(Team.id)).label('teams'),
-            session.query(func.count(Player.id)).label('players'),
-            session.query(func.count(Game.id)).label('games'),
-            session.query(func.count(PlayerGameStats.id)).label('player_game_stats'),
-            session.query(func.count(TeamGameStats.id)).label('team_game_stats'),
-            session.query(func.count(PlayerTeamSeason.id)).label('player_team_seasons'),
-            session.query(func.count(PlayerAward.id)).label('player_awards')
-        ).first()
-        
-        return {
-            'teams': stats.teams,
-            'players': stats.players,
-            'games': stats.games,
-            'player_game_stats': stats.player_game_stats,
-            'team_game_stats': stats.team_game_stats,
-            'player_team_seasons': stats.player_team_seasons,
-            'player_awards': stats.player_awards,
-        }
+        if approximate and session.get_bind().dialect.name == 'postgresql':
+            pg_class = table('pg_class', column('relname'), column('reltuples'))
+            rows = session.execute(
+                select(pg_class.c.relname, cast(pg_class.c.reltuples, BigInteger))
+                .where(pg_class.c.relname.in_([m.__tablename__ for m in _DATABASE_STATS_MODELS.values()]))
+            ).all()
+            estimates = {relname: count for relname, count in rows}
+            stats = {
+                key: estimates.get(model.__tablename__, -1)
+                for key, model in _DATABASE_STATS_MODELS.items()
+            }
+            if all(count >= 0 for count in stats.values()):
+                return stats
+
+        counts = union_all(*[
+            select(literal_column(f"'{key}'").label('k'), func.count().label('v')).select_from(model)
+            for key, model in _DATABASE_STATS_MODELS.items()
+        ])
+        stats = dict(session.execute(counts).all())
+        return {key: stats.get(key, 0) for key in _DATABASE_STATS_MODELS}
     finally:
         if own_session: 
             session.close()
@@ -162,6 +222,8 @@ def get_database_stats(session: Optional[Session] = None) -> Dict[str, int]:
 def get_teams(conference: Optional[str] = None, division: Optional[str] = None, session: Optional[Session] = None) -> List[Team]:
     """Obtiene una lista de equipos filtrada."""
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
@@ -187,27 +249,36 @@ def get_players(
 ) -> List[Player]:
     """Obtiene jugadores con filtros opcionales."""
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        query = session.query(Player)
+        # lambda_stmt cachea la construcción/compilación del SQL entre llamadas;
+        # los valores de cierre (patrones, ids) viajan como parámetros enlazados
+        stmt = lambda_stmt(lambda: select(Player))
         
         if name: 
-            query = query.filter(Player.full_name.ilike(f"%{name}%"))
+            name_pattern = f"%{name}%"
+            stmt += lambda s: s.where(Player.full_name.ilike(name_pattern))
         if position: 
-            query = query.filter(Player.position.ilike(f"%{position}%"))
+            position_pattern = f"%{position}%"
+            stmt += lambda s: s.where(Player.position.ilike(position_pattern))
         if active_only:
-            query = query.filter(Player.is_active == True)
+            stmt += lambda s: s.where(Player.is_active == True)
             
         if team_id or season:
-            query = query.join(PlayerTeamSeason)
+            stmt += lambda s: s.join(PlayerTeamSeason)
             if team_id:
-                query = query.filter(PlayerTeamSeason.team_id == team_id)
+                stmt += lambda s: s.where(PlayerTeamSeason.team_id == team_id)
             if season:
-                query = query.filter(PlayerTeamSeason.season == season)
+                stmt += lambda s: s.where(PlayerTeamSeason.season == season)
+            # Deduplicar por clave primaria (entero) en lugar de DISTINCT sobre todas las columnas
+            stmt += lambda s: s.group_by(Player.id)
                 
-        return query.order_by(Player.full_name).distinct().all()
+        stmt += lambda s: s.order_by(Player.full_name)
+        return session.execute(stmt).scalars().all()
     finally:
         if own_session: 
             session.close()
@@ -225,37 +296,41 @@ def get_games(
 ) -> List[Game]:
     """Obtiene partidos con filtros opcionales."""
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        query = session.query(Game).options(joinedload(Game.home_team), joinedload(Game.away_team))
+        stmt = lambda_stmt(
+            lambda: select(Game).options(joinedload(Game.home_team), joinedload(Game.away_team))
+        )
         
         if season: 
-            query = query.filter(Game.season == season)
+            stmt += lambda s: s.where(Game.season == season)
         if team_id: 
-            query = query.filter(or_(Game.home_team_id == team_id, Game.away_team_id == team_id))
+            stmt += lambda s: s.where(or_(Game.home_team_id == team_id, Game.away_team_id == team_id))
         if start_date: 
-            query = query.filter(Game.date >= start_date)
+            stmt += lambda s: s.where(Game.date >= start_date)
         if end_date: 
-            query = query.filter(Game.date <= end_date)
+            stmt += lambda s: s.where(Game.date <= end_date)
         if finished_only: 
-            query = query.filter(Game.status == 3)
+            stmt += lambda s: s.where(Game.status == 3)
             
         if game_type:
             if game_type.lower() in ['rs', 'regular', 'regular season']:
-                query = query.filter(Game.rs == True)
+                stmt += lambda s: s.where(Game.rs == True)
             elif game_type.lower() in ['po', 'playoffs']:
-                query = query.filter(Game.po == True)
+                stmt += lambda s: s.where(Game.po == True)
             elif game_type.lower() in ['pi', 'playin']:
-                query = query.filter(Game.pi == True)
+                stmt += lambda s: s.where(Game.pi == True)
             elif game_type.lower() in ['ist', 'cup', 'nba cup']:
-                query = query.filter(Game.ist == True)
+                stmt += lambda s: s.where(Game.ist == True)
                 
-        query = query.order_by(desc(Game.date))
+        stmt += lambda s: s.order_by(desc(Game.date))
         if limit: 
-            query = query.limit(limit)
-        return query.all()
+            stmt += lambda s: s.limit(limit)
+        return session.execute(stmt).scalars().all()
     finally:
         if own_session: 
             session.close()
@@ -269,40 +344,62 @@ def get_player_stats(
     min_points: Optional[int] = None, 
     limit: Optional[int] = None, 
     order_by_date: bool = True, 
+    columns_only: bool = False,
     session: Optional[Session] = None
-) -> List[PlayerGameStats]:
-    """Obtiene estadísticas de jugadores con filtros opcionales."""
+) -> Union[List[PlayerGameStats], List[Dict[str, Any]]]:
+    """Obtiene estadísticas de jugadores con filtros opcionales.
+    
+    Con columns_only=True no carga relaciones (player/team/game): devuelve dicts
+    con las columnas escalares de la estadística más 'game_date'.
+    """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        query = session.query(PlayerGameStats).options(
-            joinedload(PlayerGameStats.player), 
-            joinedload(PlayerGameStats.team), 
-            joinedload(PlayerGameStats.game)
-        )
-        
-        if player_id: query = query.filter(PlayerGameStats.player_id == player_id)
-        if game_id: query = query.filter(PlayerGameStats.game_id == game_id)
-        if team_id: query = query.filter(PlayerGameStats.team_id == team_id)
-        
-        if season or order_by_date: 
-            query = query.join(Game)
+        if columns_only:
+            stmt = lambda_stmt(lambda: select(
+                PlayerGameStats.id, PlayerGameStats.game_id, PlayerGameStats.player_id,
+                PlayerGameStats.team_id, PlayerGameStats.min,
+                PlayerGameStats.pts, PlayerGameStats.reb, PlayerGameStats.ast,
+                PlayerGameStats.stl, PlayerGameStats.blk, PlayerGameStats.tov,
+                PlayerGameStats.pf, PlayerGameStats.plus_minus,
+                PlayerGameStats.fgm, PlayerGameStats.fga, PlayerGameStats.fg_pct,
+                PlayerGameStats.fg3m, PlayerGameStats.fg3a, PlayerGameStats.fg3_pct,
+                PlayerGameStats.ftm, PlayerGameStats.fta, PlayerGameStats.ft_pct,
+                Game.date.label('game_date')
+            ).join(Game, PlayerGameStats.game_id == Game.id))
+        else:
+            stmt = lambda_stmt(lambda: select(PlayerGameStats).options(
+                joinedload(PlayerGameStats.player), 
+                joinedload(PlayerGameStats.team), 
+                joinedload(PlayerGameStats.game)
+            ))
+        
+        if player_id: stmt += lambda s: s.where(PlayerGameStats.player_id == player_id)
+        if game_id: stmt += lambda s: s.where(PlayerGameStats.game_id == game_id)
+        if team_id: stmt += lambda s: s.where(PlayerGameStats.team_id == team_id)
+        
+        if (season or order_by_date) and not columns_only: 
+            stmt += lambda s: s.join(Game)
             
         if season: 
-            query = query.filter(Game.season == season)
+            stmt += lambda s: s.where(Game.season == season)
         if min_points: 
-            query = query.filter(PlayerGameStats.pts >= min_points)
+            stmt += lambda s: s.where(PlayerGameStats.pts >= min_points)
             
         if order_by_date: 
-            query = query.order_by(desc(Game.date))
+            stmt += lambda s: s.order_by(desc(Game.date))
         else: 
-            query = query.order_by(desc(PlayerGameStats.pts))
+            stmt += lambda s: s.order_by(desc(PlayerGameStats.pts))
             
         if limit: 
-            query = query.limit(limit)
-        return query.all()
+            stmt += lambda s: s.limit(limit)
+        if columns_only:
+            return [dict(r._mapping) for r in session.execute(stmt)]
+        return session.execute(stmt).scalars().all()
     finally:
         if own_session: 
             session.close()
@@ -311,75 +408,110 @@ def get_player_stats(
 def get_player_season_averages(player_id: int, season: str, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
     """Obtiene promedios de un jugador en una temporada (Regular Season por defecto)."""
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        # Intentar obtener de PlayerTeamSeason (ya calculado)
-        pts_record = session.query(PlayerTeamSeason).filter(
+        # Intentar obtener de PlayerTeamSeason (ya calculado), agregando en SQL las
+        # filas de todos los equipos de la temporada (traspasos); los minutos se
+        # suman ya en segundos vía EXTRACT(epoch) sin hidratar timedelta
+        pts_agg = session.query(
+            func.sum(PlayerTeamSeason.games_played).label('games'),
+            func.sum(func.extract('epoch', PlayerTeamSeason.minutes)).label('min_s'),
+            func.sum(PlayerTeamSeason.pts).label('pts'),
+            func.sum(PlayerTeamSeason.reb).label('reb'),
+            func.sum(PlayerTeamSeason.ast).label('ast'),
+            func.sum(PlayerTeamSeason.stl).label('stl'),
+            func.sum(PlayerTeamSeason.blk).label('blk'),
+            func.sum(PlayerTeamSeason.tov).label('tov'),
+            func.sum(PlayerTeamSeason.plus_minus).label('plus_minus'),
+            func.sum(PlayerTeamSeason.fgm).label('fgm'),
+            func.sum(PlayerTeamSeason.fga).label('fga'),
+            func.sum(PlayerTeamSeason.fg3m).label('fg3m'),
+            func.sum(PlayerTeamSeason.fg3a).label('fg3a'),
+            func.sum(PlayerTeamSeason.ftm).label('ftm'),
+            func.sum(PlayerTeamSeason.fta).label('fta'),
+        ).filter(
             PlayerTeamSeason.player_id == player_id,
             PlayerTeamSeason.season == season,
             PlayerTeamSeason.type == 'Regular Season'
-        ).first()
+        ).one()
         
-        if pts_record and pts_record.games_played and pts_record.games_played > 0:
-            n = pts_record.games_played
-            total_mins = pts_record.minutes.total_seconds() / 60 if pts_record.minutes is not None else 0
+        if pts_agg.games and pts_agg.games > 0:
+            n = int(pts_agg.games)
+            total_mins = float(pts_agg.min_s or 0) / 60
             
             return {
                 'player_id': player_id, 
                 'season': season, 
                 'games': n,
-                'pts': (pts_record.pts or 0) / n, 
-                'reb': (pts_record.reb or 0) / n,
-                'ast': (pts_record.ast or 0) / n, 
-                'stl': (pts_record.stl or 0) / n,
-                'blk': (pts_record.blk or 0) / n, 
-                'tov': (pts_record.tov or 0) / n,
+                'pts': (pts_agg.pts or 0) / n, 
+                'reb': (pts_agg.reb or 0) / n,
+                'ast': (pts_agg.ast or 0) / n, 
+                'stl': (pts_agg.stl or 0) / n,
+                'blk': (pts_agg.blk or 0) / n, 
+                'tov': (pts_agg.tov or 0) / n,
                 'mpg': total_mins / n,
-                'fg_pct': (pts_record.fgm or 0) / (pts_record.fga or 1) if pts_record.fga else 0,
-                'fg3_pct': (pts_record.fg3m or 0) / (pts_record.fg3a or 1) if pts_record.fg3a else 0,
-                'ft_pct': (pts_record.ftm or 0) / (pts_record.fta or 1) if pts_record.fta else 0,
-                'plus_minus': (pts_record.plus_minus or 0) / n,
+                'fg_pct': (pts_agg.fgm or 0) / pts_agg.fga if pts_agg.fga else 0,
+                'fg3_pct': (pts_agg.fg3m or 0) / pts_agg.fg3a if pts_agg.fg3a else 0,
+                'ft_pct': (pts_agg.ftm or 0) / pts_agg.fta if pts_agg.fta else 0,
+                'plus_minus': float(pts_agg.plus_minus or 0) / n,
             }
             
-        # Fallback: calcular desde player_game_stats
-        stats = session.query(PlayerGameStats).join(Game).filter(
+        # Fallback: agregar desde player_game_stats en SQL (una sola fila de resultado;
+        # los minutos se suman ya en segundos vía EXTRACT(epoch) en lugar de timedelta)
+        min_s = func.extract('epoch', PlayerGameStats.min)
+        agg = session.query(
+            func.count(PlayerGameStats.id).label('games'),
+            func.sum(case((min_s > 0, 1), else_=0)).label('games_played'),
+            func.sum(min_s).label('min_s'),
+            func.sum(PlayerGameStats.pts).label('pts'),
+            func.sum(PlayerGameStats.reb).label('reb'),
+            func.sum(PlayerGameStats.ast).label('ast'),
+            func.sum(PlayerGameStats.stl).label('stl'),
+            func.sum(PlayerGameStats.blk).label('blk'),
+            func.sum(PlayerGameStats.tov).label('tov'),
+            func.sum(PlayerGameStats.plus_minus).label('plus_minus'),
+            func.sum(PlayerGameStats.fgm).label('fgm'),
+            func.sum(PlayerGameStats.fga).label('fga'),
+            func.sum(PlayerGameStats.fg3m).label('fg3m'),
+            func.sum(PlayerGameStats.fg3a).label('fg3a'),
+            func.sum(PlayerGameStats.ftm).label('ftm'),
+            func.sum(PlayerGameStats.fta).label('fta'),
+        ).join(Game).filter(
             PlayerGameStats.player_id == player_id, 
             Game.season == season, 
             Game.rs == True
-        ).all()
+        ).one()
         
-        if not stats: 
+        if not agg.games: 
             return None
             
-        played_stats = [s for s in stats if s.min is not None and s.min.total_seconds() > 0]
-        n_games = len(played_stats)
-        divisor = n_games if n_games > 0 else len(stats)
-        
-        total_fgm = sum(s.fgm or 0 for s in stats)
-        total_fga = sum(s.fga or 0 for s in stats)
-        total_fg3m = sum(s.fg3m or 0 for s in stats)
-        total_fg3a = sum(s.fg3a or 0 for s in stats)
-        total_ftm = sum(s.ftm or 0 for s in stats)
-        total_fta = sum(s.fta or 0 for s in stats)
-        total_mins = sum(s.min.total_seconds() if s.min is not None else 0 for s in stats) / 60
+        n_games = int(agg.games_played or 0)
+        divisor = n_games if n_games > 0 else agg.games
+        
+        total_fga = agg.fga or 0
+        total_fg3a = agg.fg3a or 0
+        total_fta = agg.fta or 0
+        total_mins = float(agg.min_s or 0) / 60
         
         return {
             'player_id': player_id, 
             'season': season, 
-            'games': len(stats),
-            'pts': sum(s.pts or 0 for s in stats) / divisor, 
-            'reb': sum(s.reb or 0 for s in stats) / divisor,
-            'ast': sum(s.ast or 0 for s in stats) / divisor, 
-            'stl': sum(s.stl or 0 for s in stats) / divisor,
-            'blk': sum(s.blk or 0 for s in stats) / divisor, 
-            'tov': sum(s.tov or 0 for s in stats) / divisor,
+            'games': agg.games,
+            'pts': (agg.pts or 0) / divisor, 
+            'reb': (agg.reb or 0) / divisor,
+            'ast': (agg.ast or 0) / divisor, 
+            'stl': (agg.stl or 0) / divisor,
+            'blk': (agg.blk or 0) / divisor, 
+            'tov': (agg.tov or 0) / divisor,
             'mpg': total_mins / divisor,
-            'fg_pct': total_fgm / total_fga if total_fga > 0 else 0.0,
-            'fg3_pct': total_fg3m / total_fg3a if total_fg3a > 0 else 0.0,
-            'ft_pct': total_ftm / total_fta if total_fta > 0 else 0.0,
-            'plus_minus': sum(s.plus_minus or 0 for s in stats) / divisor,
+            'fg_pct': (agg.fgm or 0) / total_fga if total_fga > 0 else 0.0,
+            'fg3_pct': (agg.fg3m or 0) / total_fg3a if total_fg3a > 0 else 0.0,
+            'ft_pct': (agg.ftm or 0) / total_fta if total_fta > 0 else 0.0,
+            'plus_minus': (agg.plus_minus or 0) / divisor,
         }
     finally:
         if own_session: 
@@ -387,7 +519,11 @@ def get_player_season_averages(player_id: int, season: str, session: Optional[Se
 
 
 def get_top_players(stat: str = 'pts', season: Optional[str] = None, limit: int = 10, session: Optional[Session] = None) -> List[Dict[str, Any]]:
-    """Obtiene los mejores jugadores por una estadística.
+    """Obtiene los mejores jugadores por una estadística (fase regular).
+    
+    Lee los totales precalculados de player_team_seasons (una fila por jugador,
+    equipo y temporada) en lugar de agregar cada partido de player_game_stats.
+    Los jugadores traspasados suman sus filas de todos los equipos.
     
     Para stats de conteo (pts, reb, ast, etc.) calcula el promedio por partido.
     Para porcentajes (fg_pct, fg3_pct, ft_pct) calcula SUM(made)/SUM(attempted)
@@ -411,67 +547,77 @@ def get_top_players(stat: str = 'pts', season: Optional[str] = None, limit: int
     }
     
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        games_count = func.count(PlayerGameStats.id).label('games')
+        # lambda_stmt cachea la construcción/compilación del SQL por variante
+        # (stat, con/sin temporada); season y limit viajan como parámetros enlazados.
+        # Se agrupa solo por la clave primaria: full_name depende funcionalmente de
+        # Player.id y no hace falta en la clave de agrupación
+        games_count = func.sum(PlayerTeamSeason.games_played).label('games')
         is_pct = stat in PCT_STATS
         
         if is_pct:
             made_col, att_col, min_attempts = PCT_STATS[stat]
-            total_made = func.sum(getattr(PlayerGameStats, made_col)).label('total_made')
-            total_att = func.sum(getattr(PlayerGameStats, att_col)).label('total_att')
+            total_made = func.sum(getattr(PlayerTeamSeason, made_col)).label('total_made')
+            total_att = func.sum(getattr(PlayerTeamSeason, att_col)).label('total_att')
             
-            query = session.query(
+            stmt = lambda_stmt(lambda: select(
                 Player.id,
                 Player.full_name,
                 total_made,
                 total_att,
                 games_count,
-            ).join(PlayerGameStats, Player.id == PlayerGameStats.player_id)
+            ).join(PlayerTeamSeason, Player.id == PlayerTeamSeason.player_id)
+             .where(PlayerTeamSeason.type == 'Regular Season'))
             
             if season:
-                query = query.join(Game, PlayerGameStats.game_id == Game.id).filter(Game.season == season)
+                stmt += lambda s: s.where(PlayerTeamSeason.season == season)
             
-            query = query.group_by(Player.id, Player.full_name)\
+            stmt += lambda s: s.group_by(Player.id)\
                 .having(and_(games_count >= 5, total_att >= min_attempts))\
                 .order_by(desc(total_made * 1.0 / total_att))\
                 .limit(limit)
             
-            results = query.all()
+            results = session.execute(stmt).all()
             return [
                 {
                     'id': r.id,
                     'full_name': r.full_name,
                     'value': round(float(r.total_made) / float(r.total_att), 4) if r.total_att else 0.0,
-                    'games': r.games,
+                    'games': int(r.games),
                 }
                 for r in results
             ]
         else:
-            avg_stat = func.avg(getattr(PlayerGameStats, stat)).label('avg_stat')
+            avg_stat = (
+                cast(func.sum(getattr(PlayerTeamSeason, stat)), Float) / func.nullif(games_count, 0)
+            ).label('avg_stat')
             
-            query = session.query(
+            stmt = lambda_stmt(lambda: select(
                 Player.id, 
                 Player.full_name, 
                 avg_stat,
                 games_count
-            ).join(PlayerGameStats, Player.id == PlayerGameStats.player_id)
+            ).join(PlayerTeamSeason, Player.id == PlayerTeamSeason.player_id)
+             .where(PlayerTeamSeason.type == 'Regular Season'))
             
             if season: 
-                query = query.join(Game, PlayerGameStats.game_id == Game.id).filter(Game.season == season)
+                stmt += lambda s: s.where(PlayerTeamSeason.season == season)
                 
-            query = query.group_by(Player.id, Player.full_name).having(games_count >= 5)
-            query = query.order_by(desc('avg_stat')).limit(limit)
+            stmt += lambda s: s.group_by(Player.id).having(games_count >= 5)
+            stmt += lambda s: s.order_by(desc(avg_stat)).limit(limit)
             
-            results = query.all()
+            results = session.execute(stmt).all()
             return [
                 {
                     'id': r.id, 
                     'full_name': r.full_name, 
                     'value': float(r.avg_stat) if r.avg_stat is not None else 0.0,
-                    'games': r.games
+                    'games': int(r.games)
                 } 
                 for r in results
             ]
@@ -480,76 +626,54 @@ def get_top_players(stat: str = 'pts', season: Optional[str] = None, limit: int
             session.close()
 
 
+@ttl_cache(maxsize=2048, ttl=300)
 def get_team_record(team_id: int, season: Optional[str] = None, session: Optional[Session] = None) -> Dict[str, Any]:
-    """Obtiene el récord de un equipo y su posición en la conferencia."""
+    """Obtiene el récord de un equipo y su posición en la conferencia.
+    
+    Sin sesión explícita el resultado se cachea cinco minutos por (equipo, temporada).
+    """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        # 1. Obtener info del equipo (conferencia)
-        team = session.query(Team).filter(Team.id == team_id).first()
-        if not team:
-            return {}
-        
-        conference = team.conference
-        
-        # 2. Obtener estadísticas de victorias y derrotas usando agregación SQL
-        # Es mucho más eficiente que cargar todos los partidos en memoria
-        from sqlalchemy import case
-        
-        # Filtros base
-        base_filters = [Game.status == 3, Game.rs == True]
+        # Clasificación de la conferencia en una sola consulta: la conferencia del
+        # equipo se resuelve con una subconsulta escalar (sin viaje previo a teams),
+        # cada equipo se cruza con sus partidos (local o visitante) y se cuentan
+        # victorias/derrotas. LEFT JOIN para conservar los equipos sin partidos (0-0).
+        # La posición se calcula con RANK() en el servidor y solo se devuelve la fila
+        # del equipo
+        game_filters = [Game.status == 3, Game.rs == True, Game.winner_team_id.isnot(None)]
         if season:
-            base_filters.append(Game.season == season)
-            
-        # Victorias por equipo
-        wins_stats = dict(
-            session.query(Game.winner_team_id, func.count(Game.id))
-            .filter(*base_filters)
-            .filter(Game.winner_team_id.isnot(None))
-            .group_by(Game.winner_team_id).all()
-        )
-        
-        # Derrotas por equipo (el que no ganó en un partido finalizado)
-        losses_stats = dict(
-            session.query(
-                case(
-                    (Game.winner_team_id == Game.home_team_id, Game.away_team_id),
-                    else_=Game.home_team_id
-                ).label('loser_id'),
-                func.count(Game.id)
-            )
-            .filter(*base_filters)
-            .filter(Game.winner_team_id.isnot(None))
-            .group_by('loser_id').all()
-        )
-        
-        # 3. Obtener todos los equipos de la misma conferencia para calcular el ranking
-        conf_teams = session.query(Team.id).filter(Team.conference == conference).all()
-        conf_team_ids = [t.id for t in conf_teams]
+            game_filters.append(Game.season == season)
+        
+        conference = select(Team.conference).where(Team.id == team_id).scalar_subquery()
+        wins = func.sum(case((Game.winner_team_id == Team.id, 1), else_=0))
+        losses = func.sum(case((Game.winner_team_id != Team.id, 1), else_=0))
+        pct = func.coalesce(cast(wins, Float) / func.nullif(wins + losses, 0), 0.0)
+        
+        standings = session.query(
+            Team.id.label('team_id'),
+            Team.conference.label('conference'),
+            wins.label('wins'),
+            losses.label('losses'),
+            func.rank().over(order_by=desc(pct)).label('conf_rank')
+        ).outerjoin(Game, and_(
+            or_(Game.home_team_id == Team.id, Game.away_team_id == Team.id),
+            *game_filters
+        )).filter(or_(Team.conference == conference, Team.id == team_id))\
+            .group_by(Team.id).subquery()
+        
+        team_stat = session.query(standings).filter(standings.c.team_id == team_id).first()
+        if team_stat is None:
+            return {}
         
-        # 4. Construir tabla de clasificación de la conferencia
-        standings = []
-        for tid in conf_team_ids:
-            w = wins_stats.get(tid, 0)
-            l = losses_stats.get(tid, 0)
-            pct = w / (w + l) if (w + l) > 0 else 0.0
-            standings.append({'team_id': tid, 'wins': w, 'losses': l, 'pct': pct})
-            
-        # 5. Ordenar por PCT descendente
-        standings.sort(key=lambda x: x['pct'], reverse=True)
-        
-        # 6. Extraer datos del equipo objetivo
-        target_rank = None
-        for i, s in enumerate(standings):
-            if s['team_id'] == team_id:
-                target_rank = i + 1
-                break
-        
-        team_stat = next((s for s in standings if s['team_id'] == team_id), {'wins': 0, 'losses': 0})
-        wins = team_stat['wins']
-        losses = team_stat['losses']
+        # Sin conferencia no hay posición (el equipo solo se compara consigo mismo)
+        target_rank = team_stat.conf_rank if team_stat.conference else None
+        wins = int(team_stat.wins or 0)
+        losses = int(team_stat.losses or 0)
         total = wins + losses
         
         return {
@@ -569,27 +693,31 @@ def get_team_record(team_id: int, season: Optional[str] = None, session: Optiona
 def get_game_details(game_id: str, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
     """Obtiene detalles completos de un partido."""
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
+        # Partido + estadísticas de equipo en el mismo viaje (solo 2 filas de equipo,
+        # el JOIN no multiplica el resultado de forma apreciable)
         game = session.query(Game).options(
-            joinedload(Game.home_team), 
-            joinedload(Game.away_team)
+            joinedload(Game.home_team),
+            joinedload(Game.away_team),
+            joinedload(Game.team_game_stats).joinedload(TeamGameStats.team)
         ).filter(Game.id == game_id).first()
-        
-        if not game: 
+
+        if not game:
             return None
-            
+
+        # Los dos equipos llegan en una consulta IN aparte en lugar de repetirse en cada fila
         player_stats = session.query(PlayerGameStats).options(
-            joinedload(PlayerGameStats.player), 
-            joinedload(PlayerGameStats.team)
+            joinedload(PlayerGameStats.player),
+            selectinload(PlayerGameStats.team)
         ).filter(PlayerGameStats.game_id == game_id).order_by(desc(PlayerGameStats.min), desc(PlayerGameStats.pts)).all()
-        
-        team_stats = session.query(TeamGameStats).options(
-            joinedload(TeamGameStats.team)
-        ).filter(TeamGameStats.game_id == game_id).all()
-        
+
+        team_stats = game.team_game_stats
+
         return {
             'game': {
                 'id': str(game.id), 
@@ -641,41 +769,114 @@ def get_game_details(game_id: str, session: Optional[Session] = None) -> Optiona
 def search_games_by_score(min_total: Optional[int] = None, max_total: Optional[int] = None, season: Optional[str] = None, limit: int = 10, session: Optional[Session] = None) -> List[Game]:
     """Busca partidos por rango de puntos totales."""
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
+        # Misma expresión que el índice funcional idx_games_total_score (WHERE status = 3)
+        total_score = Game.home_score + Game.away_score
         query = session.query(Game)\
             .options(joinedload(Game.home_team), joinedload(Game.away_team))\
             .filter(Game.status == 3)
         if season: 
             query = query.filter(Game.season == season)
         if min_total is not None: 
-            query = query.filter((Game.home_score + Game.away_score) >= min_total)
+            query = query.filter(total_score >= min_total)
         if max_total is not None: 
-            query = query.filter((Game.home_score + Game.away_score) <= max_total)
-        return query.order_by(desc(Game.home_score + Game.away_score)).limit(limit).all()
+            query = query.filter(total_score <= max_total)
+        return query.order_by(desc(total_score)).limit(limit).all()
     finally:
         if own_session: 
             session.close()
 
 
+# Columnas de la matriz de calculate_averages (12 stats, plus_minus y segundos jugados)
+_AVERAGE_COLUMNS = 14
+
+# Columnas de la matriz de format_summaries (partidos, minutos, 7 medias y 3 pares tiros)
+_SUMMARY_COLUMNS = 15
+
+# Columnas de player_team_seasons que lee format_summaries; las filas (Row de Core o
+# _SeasonSummaryRow si ya estaban cargadas en la sesión) añaden la abreviatura del equipo
+_SUMMARY_FIELDS = (
+    'season', 'team_id', 'type', 'games_played', 'minutes', 'pts', 'reb', 'ast', 'stl',
+    'blk', 'tov', 'plus_minus', 'fgm', 'fga', 'fg3m', 'fg3a', 'ftm', 'fta'
+)
+_SeasonSummaryRow = namedtuple('_SeasonSummaryRow', _SUMMARY_FIELDS + ('team_abbr',))
+
+
+def _loaded_team_seasons(session: Session, player_id: int) -> Optional[List[PlayerTeamSeason]]:
+    """Retorna player.team_seasons si el jugador ya está en la sesión con la relación cargada.
+    
+    Permite reutilizar el identity map (ej: la vista de detalle ya recorrió
+    player.team_seasons) sin volver a emitir SQL. Retorna None si no está disponible.
+    """
+    player = session.identity_map.get(session.identity_key(Player, player_id))
+    if player is None or 'team_seasons' in inspect(player).unloaded:
+        return None
+    return list(player.team_seasons)
+
+
+def _career_totals(arr: np.ndarray) -> Optional[Dict[str, Any]]:
+    """Totales de carrera de un tipo de temporada desde la matriz de format_summaries.
+    
+    Una sola reducción por columnas sobre las temporadas ya leídas, sin otra
+    consulta. Retorna None si el tipo no tiene partidos.
+    """
+    (total_games, total_mins, total_pts, total_reb, total_ast, total_stl, total_blk,
+     total_tov, total_plus_minus, total_fgm, total_fga, total_fg3m, total_fg3a,
+     total_ftm, total_fta) = arr.sum(axis=0).tolist()
+    if not total_games:
+        return None
+    total_games = int(total_games)
+    
+    return {
+        'games': total_games, 
+        'mpg': total_mins / total_games,
+        'ppg': total_pts / total_games, 
+        'rpg': total_reb / total_games,
+        'apg': total_ast / total_games,
+        'spg': total_stl / total_games,
+        'bpg': total_blk / total_games,
+        'topg': total_tov / total_games,
+        'fg_pct': total_fgm / total_fga if total_fga > 0 else 0,
+        'fg3_pct': total_fg3m / total_fg3a if total_fg3a > 0 else 0,
+        'ft_pct': total_ftm / total_fta if total_fta > 0 else 0,
+        'plus_minus': total_plus_minus / total_games,
+    }
+
+
 def get_player_career_stats(player_id: int, session: Optional[Session] = None) -> Dict[str, Any]:
     """Obtiene las estadísticas de carrera de un jugador."""
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
         
     try:
         # 1. Periodos recientes (últimos 100 partidos)
+        # El partido se rellena desde el JOIN ya necesario para ordenar (sin un segundo
+        # JOIN a games); jugador, equipo y rivales (que leen la plantilla y el
+        # serializador MCP, este último con la sesión ya cerrada) llegan en consultas
+        # IN aparte en lugar de cargas perezosas por fila.
+        # Solo se usan los últimos 30 días respecto a ref_date (>= hoy), así que basta
+        # con hidratar los partidos posteriores a hoy - 30 días
+        today = date.today()
         recent_stats = session.query(PlayerGameStats)\
             .join(Game)\
-            .options(joinedload(PlayerGameStats.game), joinedload(PlayerGameStats.team))\
-            .filter(PlayerGameStats.player_id == player_id)\
+            .options(
+                contains_eager(PlayerGameStats.game).selectinload(Game.home_team),
+                contains_eager(PlayerGameStats.game).selectinload(Game.away_team),
+                selectinload(PlayerGameStats.team),
+                selectinload(PlayerGameStats.player),
+            )\
+            .filter(PlayerGameStats.player_id == player_id, Game.date >= today - timedelta(days=30))\
             .order_by(desc(Game.date)).limit(100).all()
             
-        today = date.today()
         ref_date = recent_stats[0].game.date if recent_stats and recent_stats[0].game.date > today else today
         
         last_7_stats = [s for s in recent_stats if s.game.date >= ref_date - timedelta(days=7)]
@@ -683,108 +884,112 @@ def get_player_career_stats(player_id: int, session: Optional[Session] = None) -
 
         def calculate_averages(stats_list: List[PlayerGameStats]) -> Optional[Dict]:
             if not stats_list: return None
-            played_stats = [s for s in stats_list if s.min and s.min.total_seconds() > 0]
-            n = len(played_stats)
-            divisor = n if n > 0 else len(stats_list) if len(stats_list) > 0 else 1
-            
-            total_fgm = float(sum(s.fgm for s in stats_list))
-            total_fga = float(sum(s.fga for s in stats_list))
-            total_fg3m = float(sum(s.fg3m for s in stats_list))
-            total_fg3a = float(sum(s.fg3a for s in stats_list))
-            total_ftm = float(sum(s.ftm for s in stats_list))
-            total_fta = float(sum(s.fta for s in stats_list))
-            total_min_seconds = float(sum(s.min.total_seconds() if s.min else 0 for s in stats_list))
+            # Una matriz (partidos x columnas) llenada en un solo paso, sin lista
+            # intermedia de tuplas, y una sola reducción en lugar de una suma por campo
+            arr = np.fromiter(chain.from_iterable(
+                (s.pts or 0, s.reb or 0, s.ast or 0, s.stl or 0, s.blk or 0, s.tov or 0,
+                 s.fgm or 0, s.fga or 0, s.fg3m or 0, s.fg3a or 0, s.ftm or 0, s.fta or 0,
+                 s.plus_minus or 0, s.min.total_seconds() if s.min else 0)
+                for s in stats_list
+            ), dtype=np.float64, count=len(stats_list) * _AVERAGE_COLUMNS).reshape(-1, _AVERAGE_COLUMNS)
+            (total_pts, total_reb, total_ast, total_stl, total_blk, total_tov,
+             total_fgm, total_fga, total_fg3m, total_fg3a, total_ftm, total_fta,
+             total_plus_minus, total_min_seconds) = arr.sum(axis=0).tolist()
+            n = int(np.count_nonzero(arr[:, -1] > 0))
+            divisor = n if n > 0 else len(stats_list)
             
             return {
                 'games': len(stats_list), 
                 'games_played': n, 
                 'mpg': (total_min_seconds / 60) / divisor,
-                'ppg': float(sum(s.pts for s in stats_list)) / divisor,
-                'rpg': float(sum(s.reb for s in stats_list)) / divisor,
-                'apg': float(sum(s.ast for s in stats_list)) / divisor,
-                'spg': float(sum(s.stl for s in stats_list)) / divisor,
-                'bpg': float(sum(s.blk for s in stats_list)) / divisor,
-                'topg': float(sum(s.tov for s in stats_list)) / divisor,
+                'ppg': total_pts / divisor,
+                'rpg': total_reb / divisor,
+                'apg': total_ast / divisor,
+                'spg': total_stl / divisor,
+                'bpg': total_blk / divisor,
+                'topg': total_tov / divisor,
                 'fg_pct': total_fgm / total_fga if total_fga > 0 else 0.0,
                 'fg3_pct': total_fg3m / total_fg3a if total_fg3a > 0 else 0.0,
                 'ft_pct': total_ftm / total_fta if total_fta > 0 else 0.0,
-                'plus_minus': float(sum(s.plus_minus or 0 for s in stats_list)) / divisor,
+                'plus_minus': total_plus_minus / divisor,
             }
 
-        # 2. Historial desde player_team_seasons
-        pts_records = session.query(PlayerTeamSeason)\
-            .options(joinedload(PlayerTeamSeason.team))\
-            .filter(PlayerTeamSeason.player_id == player_id)\
-            .order_by(desc(PlayerTeamSeason.season), desc(PlayerTeamSeason.type)).all()
-
-        def format_summary(r: PlayerTeamSeason):
-            n = r.games_played or 1
-            total_mins = r.minutes.total_seconds() / 60 if r.minutes else 0
-            return {
-                'season': r.season, 
-                'team_abbr': r.team.abbreviation if r.team else '???',
-                'team_id': r.team_id,
-                'type': r.type,
-                'games': r.games_played, 
-                'mpg': total_mins / n,
-                'ppg': (r.pts or 0) / n, 
-                'rpg': (r.reb or 0) / n, 
-                'apg': (r.ast or 0) / n,
-                'spg': (r.stl or 0) / n, 
-                'bpg': (r.blk or 0) / n, 
-                'topg': (r.tov or 0) / n,
-                'fg_pct': (r.fgm or 0) / (r.fga or 1) if (r.fga or 0) > 0 else 0,
-                'fg3_pct': (r.fg3m or 0) / (r.fg3a or 1) if (r.fg3a or 0) > 0 else 0,
-                'ft_pct': (r.ftm or 0) / (r.fta or 1) if (r.fta or 0) > 0 else 0,
-                'plus_minus': (r.plus_minus or 0) / n,
-                '_total_pts': r.pts or 0, 
-                '_total_reb': r.reb or 0, 
-                '_total_ast': r.ast or 0,
-                '_total_stl': r.stl or 0, 
-                '_total_blk': r.blk or 0, 
-                '_total_tov': r.tov or 0,
-                '_total_fgm': r.fgm or 0, 
-                '_total_fga': r.fga or 0, 
-                '_total_fg3m': r.fg3m or 0,
-                '_total_fg3a': r.fg3a or 0, 
-                '_total_ftm': r.ftm or 0, 
-                '_total_fta': r.fta or 0,
-                '_total_min_seconds': r.minutes.total_seconds() if r.minutes else 0,
-                '_total_plus_minus': r.plus_minus or 0,
-            }
-
-        rs_list = [format_summary(r) for r in pts_records if r.type == 'Regular Season']
-        po_list = [format_summary(r) for r in pts_records if r.type == 'Playoffs']
-        ist_list = [format_summary(r) for r in pts_records if r.type == 'NBA Cup']
+        # 2. Historial desde player_team_seasons (reutiliza la sesión si ya está cargado)
+        pts_records = _loaded_team_seasons(session, player_id)
+        if pts_records is not None:
+            pts_records = sorted(pts_records, key=lambda r: (r.season, r.type), reverse=True)
+            # Equipos aún sin cargar: una sola consulta IN los deja en el identity map,
+            # de modo que r.team no emite una carga por fila
+            missing_team_ids = {r.team_id for r in pts_records if 'team' in inspect(r).unloaded}
+            if missing_team_ids:
+                session.query(Team).filter(Team.id.in_(missing_team_ids)).all()
+            pts_records = [
+                _SeasonSummaryRow(*(getattr(r, field) for field in _SUMMARY_FIELDS),
+                                  r.team.abbreviation if r.team else None)
+                for r in pts_records
+            ]
+        else:
+            # Filas de columnas vía Core (sin hidratar objetos ORM ni registrar en el
+            # identity map); la abreviatura del equipo llega en el mismo JOIN
+            pts_records = session.execute(
+                select(*[getattr(PlayerTeamSeason, field) for field in _SUMMARY_FIELDS],
+                       Team.abbreviation.label('team_abbr'))
+                .outerjoin(Team, PlayerTeamSeason.team_id == Team.id)
+                .where(PlayerTeamSeason.player_id == player_id)
+                .order_by(desc(PlayerTeamSeason.season), desc(PlayerTeamSeason.type))
+            ).all()
 
-        def calculate_career_totals(data_list: List[Dict]) -> Optional[Dict]:
-            if not data_list: return None
-            total_games = sum(d['games'] for d in data_list)
-            if total_games == 0: return None
-            
-            total_pts = sum(d['_total_pts'] for d in data_list)
-            total_min_secs = sum(d['_total_min_seconds'] for d in data_list)
-            total_fga = sum(d['_total_fga'] for d in data_list)
-            total_fgm = sum(d['_total_fgm'] for d in data_list)
-            total_fg3a = sum(d['_total_fg3a'] for d in data_list)
-            total_fg3m = sum(d['_total_fg3m'] for d in data_list)
-            total_fta = sum(d['_total_fta'] for d in data_list)
-            total_ftm = sum(d['_total_ftm'] for d in data_list)
+        def format_summaries(records: List[_SeasonSummaryRow]) -> Tuple[List[Dict], Optional[Dict]]:
+            if not records: return [], None
+            # Matriz (temporadas x columnas) en un solo paso; medias y porcentajes se
+            # calculan por columnas en lugar de ~20 coalesces y divisiones por fila
+            arr = np.fromiter(chain.from_iterable(
+                (r.games_played or 0, r.minutes.total_seconds() / 60 if r.minutes else 0,
+                 r.pts or 0, r.reb or 0, r.ast or 0, r.stl or 0, r.blk or 0, r.tov or 0,
+                 r.plus_minus or 0, r.fgm or 0, r.fga or 0, r.fg3m or 0, r.fg3a or 0,
+                 r.ftm or 0, r.fta or 0)
+                for r in records
+            ), dtype=np.float64, count=len(records) * _SUMMARY_COLUMNS).reshape(-1, _SUMMARY_COLUMNS)
+            n = np.where(arr[:, 0] > 0, arr[:, 0], 1.0)
+            per_game = (arr[:, 1:9] / n[:, None]).tolist()
+            made, attempts = arr[:, 9::2], arr[:, 10::2]
+            pcts = np.divide(made, attempts, out=np.zeros_like(made), where=attempts > 0).tolist()
             
-            return {
-                'games': total_games, 
-                'mpg': (total_min_secs / 60) / total_games,
-                'ppg': total_pts / total_games, 
-                'rpg': sum(d['_total_reb'] for d in data_list) / total_games,
-                'apg': sum(d['_total_ast'] for d in data_list) / total_games,
-                'spg': sum(d['_total_stl'] for d in data_list) / total_games,
-                'bpg': sum(d['_total_blk'] for d in data_list) / total_games,
-                'topg': sum(d['_total_tov'] for d in data_list) / total_games,
-                'fg_pct': total_fgm / total_fga if total_fga > 0 else 0,
-                'fg3_pct': total_fg3m / total_fg3a if total_fg3a > 0 else 0,
-                'ft_pct': total_ftm / total_fta if total_fta > 0 else 0,
-                'plus_minus': sum(d['_total_plus_minus'] for d in data_list) / total_games,
-            }
+            summaries = [
+                {
+                    'season': r.season, 
+                    'team_abbr': r.team_abbr or '???',
+                    'team_id': r.team_id,
+                    'type': r.type,
+                    'games': r.games_played, 
+                    'mpg': mpg,
+                    'ppg': ppg, 
+                    'rpg': rpg, 
+                    'apg': apg,
+                    'spg': spg, 
+                    'bpg': bpg, 
+                    'topg': topg,
+                    'fg_pct': fg_pct,
+                    'fg3_pct': fg3_pct,
+                    'ft_pct': ft_pct,
+                    'plus_minus': plus_minus,
+                }
+                for r, (mpg, ppg, rpg, apg, spg, bpg, topg, plus_minus), (fg_pct, fg3_pct, ft_pct)
+                in zip(records, per_game, pcts)
+            ]
+            # Totales del tipo en la misma matriz (un recorrido en lugar de otra consulta)
+            return summaries, _career_totals(arr)
+
+        # Un solo recorrido reparte las temporadas por tipo
+        rs_records, po_records, ist_records = [], [], []
+        buckets = {'Regular Season': rs_records, 'Playoffs': po_records, 'NBA Cup': ist_records}
+        for r in pts_records:
+            bucket = buckets.get(r.type)
+            if bucket is not None:
+                bucket.append(r)
+        rs_list, rs_totals = format_summaries(rs_records)
+        po_list, po_totals = format_summaries(po_records)
+        ist_list, ist_totals = format_summaries(ist_records)
 
         return {
             'last_7_days': {'games': last_7_stats, 'averages': calculate_averages(last_7_stats)},
@@ -792,67 +997,275 @@ def get_player_career_stats(player_id: int, session: Optional[Session] = None) -
             'regular_season': rs_list, 
             'playoffs': po_list, 
             'ist': ist_list,
-            'rs_totals': calculate_career_totals(rs_list), 
-            'po_totals': calculate_career_totals(po_list), 
-            'ist_totals': calculate_career_totals(ist_list),
+            'rs_totals': rs_totals, 
+            'po_totals': po_totals, 
+            'ist_totals': ist_totals,
         }
     finally:
         if own_session: 
             session.close()
 
 
+# Orden de importancia de los tipos de premio para mostrar
+_AWARD_TYPE_RANK = {atype: i for i, atype in enumerate([
+    'Champion', 'NBA Cup', 'MVP', 'Finals MVP', 'DPOY', 'ROY', 
+    '6MOY', 'MIP', 'All-Star', 'All-NBA', 'All-Defensive', 
+    'All-Rookie', 'Olympic Gold', 'Olympic Silver', 'Olympic Bronze', 
+    'All-Star MVP', 'NBA Cup MVP', 'NBA Cup Team', 'POM', 'POW', 'ROM'
+])}
+_UNRANKED_AWARD_TYPE = len(_AWARD_TYPE_RANK)
+
+
+@ttl_cache(maxsize=512, ttl=60)
 def get_player_awards(player_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
     """Obtiene los premios del jugador agrupados por tipo."""
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        from collections import defaultdict
-        awards = session.query(PlayerAward).filter(PlayerAward.player_id == player_id).order_by(desc(PlayerAward.season)).all()
-        if not awards: 
-            return []
-            
-        grouped = defaultdict(list)
-        award_types = {}
-        for a in awards:
-            grouped[a.award_name].append({
-                'season': a.season, 
-                'name': a.award_name, 
-                'description': a.description
-            })
-            award_types[a.award_name] = a.award_type
-            
-        # Orden de importancia para mostrar
-        type_importance = [
-            'Champion', 'NBA Cup', 'MVP', 'Finals MVP', 'DPOY', 'ROY', 
-            '6MOY', 'MIP', 'All-Star', 'All-NBA', 'All-Defensive', 
-            'All-Rookie', 'Olympic Gold', 'Olympic Silver', 'Olympic Bronze', 
-            'All-Star MVP', 'NBA Cup MVP', 'NBA Cup Team', 'POM', 'POW', 'ROM'
-        ]
-        
-        result, type_to_names = [], defaultdict(list)
-        for name in grouped.keys(): 
-            type_to_names[award_types[name]].append(name)
-            
-        for atype in type_importance:
-            if atype in type_to_names:
-                for name in sorted(type_to_names[atype]):
-                    result.append({
-                        'type': atype, 
-                        'count': len(grouped[name]), 
-                        'award_items': grouped[name], 
-                        'display_name': name if atype != 'Champion' else 'NBA Champion'
-                    })
-                    del grouped[name]
-                    
-        # Añadir cualquier otro no clasificado
-        for name, items in grouped.items():
-            result.append({
-                'type': award_types[name], 
+        # Tuplas de columnas (sin hidratar objetos ORM), ya ordenadas por tipo, nombre y
+        # temporada (índice idx_player_awards_player_type_name): se agrupan en streaming
+        rows = session.query(
+            PlayerAward.award_type, PlayerAward.award_name,
+            PlayerAward.season, PlayerAward.description
+        ).filter(PlayerAward.player_id == player_id)\
+            .order_by(PlayerAward.award_type, PlayerAward.award_name, desc(PlayerAward.season)).all()
+        
+        # Una lista por rango de importancia (más una final para tipos sin clasificar):
+        # cada grupo se añade a la suya y el resultado es la concatenación, sin ordenar.
+        # Dentro de cada lista se conserva el orden de SQL
+        buckets = [[] for _ in range(_UNRANKED_AWARD_TYPE + 1)]
+        for (atype, name), group in groupby(rows, key=itemgetter(0, 1)):
+            items = [
+                {'season': season, 'name': name, 'description': description}
+                for _, _, season, description in group
+            ]
+            buckets[_AWARD_TYPE_RANK.get(atype, _UNRANKED_AWARD_TYPE)].append({
+                'type': atype, 
                 'count': len(items), 
                 'award_items': items, 
-                'display_name': name
+                'display_name': name if atype != 'Champion' else 'NBA Champion'
+            })
+        
+        return list(chain.from_iterable(buckets))
+    finally:
+        if own_session: 
+            session.close()
+
+
+def _player_latest_game_date(session: Session, player_id: int) -> Optional[date]:
+    """Fecha del último partido del jugador (versión de la caché de career highs)."""
+    return session.query(func.max(Game.date))\
+        .join(PlayerGameStats, PlayerGameStats.game_id == Game.id)\
+        .filter(PlayerGameStats.player_id == player_id)\
+        .scalar()
+
+
+# Umbrales de hitos de carrera. Cada uno tiene un índice parcial en player_game_stats
+# (ver db/models.py) cuyo predicado debe coincidir literalmente con el de la consulta.
+_MILESTONE_THRESHOLDS = {
+    'p60': (PlayerGameStats.pts, 60),
+    'p50': (PlayerGameStats.pts, 50),
+    'p40': (PlayerGameStats.pts, 40),
+    'r20': (PlayerGameStats.reb, 20),
+    'a20': (PlayerGameStats.ast, 20),
+    's5': (PlayerGameStats.stl, 5),
+    'b5': (PlayerGameStats.blk, 5),
+    't10': (PlayerGameStats.fg3m, 10),
+}
+
+
+def _milestone_count(player_id, column, threshold: int):
+    """Subconsulta escalar con el número de partidos del jugador con `column >= threshold`.
+
+    `player_id` puede ser un entero o la columna de la consulta exterior (subconsulta
+    correlacionada por jugador). El umbral se emite como literal (no como parámetro)
+    para que el planificador pueda elegir el índice parcial correspondiente.
+    """
+    return select(func.count())\
+        .select_from(PlayerGameStats)\
+        .where(PlayerGameStats.player_id == player_id,
+               column >= literal_column(str(threshold)))\
+        .correlate_except(PlayerGameStats)\
+        .scalar_subquery()
+
+
+# Resultado de get_player_career_highs para jugadores sin partidos (se devuelve una copia)
+_EMPTY_CAREER_HIGHS = {
+    'pts': None, 'reb': None, 'ast': None, 'stl': None, 'blk': None, 
+    'fg3m': None, 'fgm': None, 'ftm': None, 'min': None, 'plus_minus': None, 
+    'double_doubles': 0, 'triple_doubles': 0, 
+    'games_40_pts': 0, 'games_50_pts': 0, 'games_60_pts': 0, 
+    'games_20_reb': 0, 'games_20_ast': 0, 'games_5_stl': 0, 
+    'games_5_blk': 0, 'games_10_3pm': 0, 'total_games': 0
+}
+
+
+# Estadísticas con récord de carrera (máximo y partido en que se logró)
+_HIGH_STATS = ('pts', 'reb', 'ast', 'stl', 'blk', 'fg3m', 'fgm', 'ftm', 'min', 'plus_minus')
+
+
+def _build_career_highs_statements():
+    """Construye una sola vez las dos sentencias de los récords de carrera.
+    
+    Ambas reciben la lista de jugadores como parámetro expandible `player_ids`,
+    de modo que ni el árbol de expresiones (con sus CASE) ni su compilación se
+    rehacen en cada llamada.
+    """
+    player_ids = bindparam('player_ids', expanding=True)
+    
+    # Máximos y conteos de hitos agrupados por jugador. Las categorías de doble dígito
+    # se cuentan una sola vez por fila en una subconsulta y los dobles/triples dobles
+    # se agregan sobre ese valor
+    cat_count = (
+        cast(PlayerGameStats.pts >= 10, Integer) +
+        cast(PlayerGameStats.reb >= 10, Integer) +
+        cast(PlayerGameStats.ast >= 10, Integer) +
+        cast(PlayerGameStats.stl >= 10, Integer) +
+        cast(PlayerGameStats.blk >= 10, Integer)
+    )
+    # Minutos como float directamente desde SQL (sin construir timedelta en Python)
+    min_minutes = cast(func.extract('epoch', PlayerGameStats.min) / 60, Float)
+    # Expresión de cada estadística (los minutos, en la misma escala que su máximo)
+    high_columns = {attr: getattr(PlayerGameStats, attr) for attr in _HIGH_STATS}
+    high_columns['min'] = min_minutes
+
+    per_game = select(
+        PlayerGameStats.id, PlayerGameStats.player_id,
+        *[high_columns[attr].label(attr) for attr in _HIGH_STATS],
+        cat_count.label('cat_count')
+    ).where(PlayerGameStats.player_id.in_(player_ids)).subquery()
+
+    stats_stmt = select(
+        per_game.c.player_id,
+        func.count(per_game.c.id).label('total_games'),
+        *[func.max(per_game.c[attr]).label(f'max_{attr}') for attr in _HIGH_STATS],
+        # Conteos de hitos: un count(*) escalar por umbral, servido por su índice parcial.
+        # El CASE sobre el máximo evita ejecutar la subconsulta si el jugador no llega al umbral
+        *[case((func.max(per_game.c[column.key]) >= threshold,
+                _milestone_count(per_game.c.player_id, column, threshold)),
+               else_=0).label(label)
+          for label, (column, threshold) in _MILESTONE_THRESHOLDS.items()],
+        # Dobles y Triples dobles
+        func.sum(case((per_game.c.cat_count >= 3, 1), else_=0)).label('td'),
+        func.sum(case((per_game.c.cat_count >= 2, 1), else_=0)).label('dd')
+    ).group_by(per_game.c.player_id)
+    
+    # Partido de cada récord: una rama por estadística (UNION ALL) que cruza los
+    # partidos con el máximo del jugador; ROW_NUMBER por (jugador, estadística)
+    # deja solo el más reciente. Columnas sueltas (sin objetos ORM) y rival resuelto en SQL
+    maxima = select(
+        PlayerGameStats.player_id,
+        *[func.max(high_columns[attr]).label(f'max_{attr}') for attr in _HIGH_STATS]
+    ).where(PlayerGameStats.player_id.in_(player_ids))\
+        .group_by(PlayerGameStats.player_id).cte('maxima')
+
+    HomeTeam, AwayTeam = aliased(Team), aliased(Team)
+    vs_team = case((PlayerGameStats.team_id == Game.home_team_id, AwayTeam.abbreviation),
+                   else_=HomeTeam.abbreviation)
+    matches = union_all(*[
+        select(
+            PlayerGameStats.player_id.label('player_id'),
+            literal(attr).label('stat'),
+            Game.id.label('game_id'), Game.date.label('date'), Game.season.label('season'),
+            vs_team.label('vs_team')
+        ).select_from(PlayerGameStats)
+        .join(maxima, and_(maxima.c.player_id == PlayerGameStats.player_id,
+                           maxima.c[f'max_{attr}'] == high_columns[attr]))
+        .join(Game, PlayerGameStats.game_id == Game.id)
+        .join(HomeTeam, Game.home_team_id == HomeTeam.id)
+        .join(AwayTeam, Game.away_team_id == AwayTeam.id)
+        for attr in _HIGH_STATS
+    ]).subquery()
+    ranked = select(
+        matches,
+        func.row_number().over(partition_by=(matches.c.player_id, matches.c.stat),
+                               order_by=desc(matches.c.date)).label('rn')
+    ).subquery()
+    detail_stmt = select(ranked).where(ranked.c.rn == 1)
+    
+    # Detalle de partidos ya conocidos (récords precalculados en player_career_highs)
+    games_stmt = select(
+        Game.id.label('game_id'), Game.date.label('date'), Game.season.label('season'),
+        vs_team.label('vs_team')
+    ).select_from(PlayerGameStats)\
+        .join(Game, PlayerGameStats.game_id == Game.id)\
+        .join(HomeTeam, Game.home_team_id == HomeTeam.id)\
+        .join(AwayTeam, Game.away_team_id == AwayTeam.id)\
+        .where(PlayerGameStats.player_id == bindparam('player_id'),
+               Game.id.in_(bindparam('game_ids', expanding=True)))
+    
+    return stats_stmt, detail_stmt, games_stmt
+
+
+(_CAREER_HIGHS_STATS_STMT, _CAREER_HIGHS_DETAIL_STMT,
+ _CAREER_HIGHS_GAMES_STMT) = _build_career_highs_statements()
+
+
+def get_career_highs_bulk(player_ids: List[int], session: Optional[Session] = None) -> Dict[int, Dict[str, Any]]:
+    """Obtiene los récords personales de varios jugadores con dos consultas en total.
+    
+    Pensada para páginas con muchos jugadores (plantillas, portadas), donde llamar a
+    get_player_career_highs en bucle generaría 2N consultas.
+    
+    Args:
+        player_ids: IDs de los jugadores
+        session: Sesión de SQLAlchemy (opcional)
+        
+    Returns:
+        Diccionario {player_id: récords} con el mismo formato que get_player_career_highs
+    """
+    own_session = False
+    if session is None:
+        session = current_session()
+    if session is None:
+        session = get_session()
+        own_session = True
+    try:
+        player_ids = list(dict.fromkeys(player_ids))
+        result = {pid: dict(_EMPTY_CAREER_HIGHS) for pid in player_ids}
+        if not player_ids:
+            return result
+        
+        # 1. Máximos y conteos de hitos agrupados por jugador (sentencia precompilada)
+        params = {'player_ids': player_ids}
+        stats_rows = session.execute(_CAREER_HIGHS_STATS_STMT, params).all()
+        if not stats_rows:
+            return result
+        
+        # 2. Partido más reciente de cada récord
+        best_by_stat = {
+            (row.player_id, row.stat): row
+            for row in session.execute(_CAREER_HIGHS_DETAIL_STMT, params)
+        }
+        
+        for stats in stats_rows:
+            highs = result[stats.player_id]
+            for attr in _HIGH_STATS:
+                best = best_by_stat.get((stats.player_id, attr))
+                if best:
+                    highs[attr] = {
+                        'value': getattr(stats, f'max_{attr}'), 
+                        'game_id': best.game_id, 
+                        'date': best.date, 
+                        'vs_team': best.vs_team, 
+                        'season': best.season
+                    }
+            highs.update({
+                'double_doubles': int(stats.dd or 0),
+                'triple_doubles': int(stats.td or 0),
+                'games_40_pts': int(stats.p40 or 0) - int(stats.p50 or 0),
+                'games_50_pts': int(stats.p50 or 0) - int(stats.p60 or 0),
+                'games_60_pts': int(stats.p60 or 0),
+                'games_20_reb': int(stats.r20 or 0),
+                'games_20_ast': int(stats.a20 or 0),
+                'games_5_stl': int(stats.s5 or 0),
+                'games_5_blk': int(stats.b5 or 0),
+                'games_10_3pm': int(stats.t10 or 0),
+                'total_games': stats.total_games
             })
         return result
     finally:
@@ -860,118 +1273,53 @@ def get_player_awards(player_id: int, session: Optional[Session] = None) -> List
             session.close()
 
 
+def _stored_career_highs(session: Session, stored: PlayerCareerHigh) -> Dict[str, Any]:
+    """Construye el resultado de get_player_career_highs desde la fila precalculada."""
+    result = {field: getattr(stored, field) for field in _EMPTY_CAREER_HIGHS if field not in _HIGH_STATS}
+    
+    game_ids = {getattr(stored, f'{attr}_game_id') for attr in _HIGH_STATS} - {None}
+    games = {}
+    if game_ids:
+        games = {
+            row.game_id: row
+            for row in session.execute(_CAREER_HIGHS_GAMES_STMT,
+                                       {'player_id': stored.player_id, 'game_ids': list(game_ids)})
+        }
+    
+    for attr in _HIGH_STATS:
+        game = games.get(getattr(stored, f'{attr}_game_id'))
+        result[attr] = {
+            'value': getattr(stored, attr), 
+            'game_id': game.game_id, 
+            'date': game.date, 
+            'vs_team': game.vs_team, 
+            'season': game.season
+        } if game else None
+    return result
+
+
+@ttl_cache(maxsize=512, ttl=60, version=_player_latest_game_date)
 def get_player_career_highs(player_id: int, session: Optional[Session] = None) -> Dict[str, Any]:
-    """Obtiene los récords personales máximos del jugador."""
+    """Obtiene los récords personales máximos del jugador.
+    
+    Usa la tabla derivada player_career_highs si el jugador ya tiene fila; si no
+    (aún no se han regenerado las tablas derivadas), los calcula desde los partidos.
+    """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        from sqlalchemy import case, func
-        
-        # 1. Obtener los valores máximos y conteos de hitos en una sola consulta SQL
-        # Esto evita cargar miles de registros en memoria
-        stats_query = session.query(
-            func.count(PlayerGameStats.id).label('total_games'),
-            func.max(PlayerGameStats.pts).label('max_pts'),
-            func.max(PlayerGameStats.reb).label('max_reb'),
-            func.max(PlayerGameStats.ast).label('max_ast'),
-            func.max(PlayerGameStats.stl).label('max_stl'),
-            func.max(PlayerGameStats.blk).label('max_blk'),
-            func.max(PlayerGameStats.fg3m).label('max_fg3m'),
-            func.max(PlayerGameStats.fgm).label('max_fgm'),
-            func.max(PlayerGameStats.ftm).label('max_ftm'),
-            func.max(PlayerGameStats.min).label('max_min'),
-            func.max(PlayerGameStats.plus_minus).label('max_plus_minus'),
-            # Conteos de hitos
-            func.sum(case((PlayerGameStats.pts >= 60, 1), else_=0)).label('g60'),
-            func.sum(case((and_(PlayerGameStats.pts >= 50, PlayerGameStats.pts < 60), 1), else_=0)).label('g50'),
-            func.sum(case((and_(PlayerGameStats.pts >= 40, PlayerGameStats.pts < 50), 1), else_=0)).label('g40'),
-            func.sum(case((PlayerGameStats.reb >= 20, 1), else_=0)).label('r20'),
-            func.sum(case((PlayerGameStats.ast >= 20, 1), else_=0)).label('a20'),
-            func.sum(case((PlayerGameStats.stl >= 5, 1), else_=0)).label('s5'),
-            func.sum(case((PlayerGameStats.blk >= 5, 1), else_=0)).label('b5'),
-            func.sum(case((PlayerGameStats.fg3m >= 10, 1), else_=0)).label('t10'),
-            # Dobles y Triples dobles (Lógica SQL)
-            func.sum(case((
-                case((PlayerGameStats.pts >= 10, 1), else_=0) +
-                case((PlayerGameStats.reb >= 10, 1), else_=0) +
-                case((PlayerGameStats.ast >= 10, 1), else_=0) +
-                case((PlayerGameStats.stl >= 10, 1), else_=0) +
-                case((PlayerGameStats.blk >= 10, 1), else_=0) >= 3, 1), else_=0
-            )).label('td'),
-            func.sum(case((
-                case((PlayerGameStats.pts >= 10, 1), else_=0) +
-                case((PlayerGameStats.reb >= 10, 1), else_=0) +
-                case((PlayerGameStats.ast >= 10, 1), else_=0) +
-                case((PlayerGameStats.stl >= 10, 1), else_=0) +
-                case((PlayerGameStats.blk >= 10, 1), else_=0) >= 2, 1), else_=0
-            )).label('dd')
-        ).filter(PlayerGameStats.player_id == player_id).first()
-        
-        if not stats_query or stats_query.total_games == 0:
-            return {
-                'pts': None, 'reb': None, 'ast': None, 'stl': None, 'blk': None, 
-                'fg3m': None, 'fgm': None, 'ftm': None, 'min': None, 'plus_minus': None, 
-                'double_doubles': 0, 'triple_doubles': 0, 
-                'games_40_pts': 0, 'games_50_pts': 0, 'games_60_pts': 0, 
-                'games_20_reb': 0, 'games_20_ast': 0, 'games_5_stl': 0, 
-                'games_5_blk': 0, 'games_10_3pm': 0, 'total_games': 0
-            }
-            
-        # 2. Para cada máximo, obtener los detalles del partido correspondiente
-        # Solo hacemos esto para los campos que el usuario realmente ve en el UI
-        def get_high_detail(stat_attr, max_val):
-            if max_val is None: return None
-            
-            # Buscar el partido donde ocurrió este máximo
-            best_game_stat = session.query(PlayerGameStats)\
-                .options(joinedload(PlayerGameStats.game).joinedload(Game.home_team),
-                         joinedload(PlayerGameStats.game).joinedload(Game.away_team))\
-                .filter(PlayerGameStats.player_id == player_id, 
-                        getattr(PlayerGameStats, stat_attr) == max_val)\
-                .join(Game).order_by(desc(Game.date)).first()
-            
-            if not best_game_stat: return None
-            
-            game = best_game_stat.game
-            vs = game.away_team.abbreviation if best_game_stat.team_id == game.home_team_id else game.home_team.abbreviation
-            
-            val = max_val
-            if stat_attr == 'min':
-                val = max_val.total_seconds() / 60
-                
-            return {
-                'value': val, 
-                'game_id': game.id, 
-                'date': game.date, 
-                'vs_team': vs, 
-                'season': game.season
-            }
-            
-        return {
-            'pts': get_high_detail('pts', stats_query.max_pts),
-            'reb': get_high_detail('reb', stats_query.max_reb),
-            'ast': get_high_detail('ast', stats_query.max_ast),
-            'stl': get_high_detail('stl', stats_query.max_stl),
-            'blk': get_high_detail('blk', stats_query.max_blk),
-            'fg3m': get_high_detail('fg3m', stats_query.max_fg3m),
-            'fgm': get_high_detail('fgm', stats_query.max_fgm),
-            'ftm': get_high_detail('ftm', stats_query.max_ftm),
-            'min': get_high_detail('min', stats_query.max_min),
-            'plus_minus': get_high_detail('plus_minus', stats_query.max_plus_minus),
-            'double_doubles': int(stats_query.dd or 0),
-            'triple_doubles': int(stats_query.td or 0),
-            'games_40_pts': int(stats_query.g40 or 0),
-            'games_50_pts': int(stats_query.g50 or 0),
-            'games_60_pts': int(stats_query.g60 or 0),
-            'games_20_reb': int(stats_query.r20 or 0),
-            'games_20_ast': int(stats_query.a20 or 0),
-            'games_5_stl': int(stats_query.s5 or 0),
-            'games_5_blk': int(stats_query.b5 or 0),
-            'games_10_3pm': int(stats_query.t10 or 0),
-            'total_games': stats_query.total_games
-        }
+        stored = session.get(PlayerCareerHigh, player_id)
+        if stored is not None:
+            return _stored_career_highs(session, stored)
+        
+        # Sin sondeo previo de existencia: si el agregado no devuelve filas (jugador
+        # sin partidos), get_career_highs_bulk retorna el registro vacío sin lanzar
+        # la consulta de detalle
+        return get_career_highs_bulk([player_id], session=session)[player_id]
     finally:
         if own_session: 
             session.close()
@@ -981,13 +1329,18 @@ def get_player_career_highs(player_id: int, session: Optional[Session] = None) -
 # Funciones de Temporadas y Clasificaciones
 # ============================================================
 
+@ttl_cache(maxsize=1, ttl=300)
 def get_all_seasons(session: Optional[Session] = None) -> List[str]:
     """Obtiene todas las temporadas disponibles ordenadas de más reciente a más antigua.
     
+    Sin sesión explícita el resultado se cachea cinco minutos.
+    
     Returns:
         Lista de strings de temporada (ej: ["2025-26", "2024-25", ...])
     """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
@@ -1002,11 +1355,13 @@ def get_all_seasons(session: Optional[Session] = None) -> List[str]:
             session.close()
 
 
+@ttl_cache(maxsize=64, ttl=300)
 def get_season_standings(season: str, session: Optional[Session] = None) -> Dict[str, List[Dict[str, Any]]]:
     """Obtiene la clasificación completa de ambas conferencias para una temporada.
     
     Calcula victorias/derrotas de Regular Season usando agregaciones SQL
-    y agrupa los equipos por conferencia con ranking.
+    y agrupa los equipos por conferencia con ranking. Sin sesión explícita el
+    resultado se cachea cinco minutos por temporada.
     
     Args:
         season: Temporada (ej: "2023-24")
@@ -1016,60 +1371,45 @@ def get_season_standings(season: str, session: Optional[Session] = None) -> Dict
         Cada equipo: {team_id, abbreviation, full_name, conference, division, wins, losses, pct, rank}
     """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
-        base_filters = [Game.status == 3, Game.rs == True, Game.season == season]
-        
-        # Victorias por equipo
-        wins_stats = dict(
-            session.query(Game.winner_team_id, func.count(Game.id))
-            .filter(*base_filters)
-            .filter(Game.winner_team_id.isnot(None))
-            .group_by(Game.winner_team_id).all()
-        )
-        
-        # Derrotas por equipo
-        losses_stats = dict(
-            session.query(
-                case(
-                    (Game.winner_team_id == Game.home_team_id, Game.away_team_id),
-                    else_=Game.home_team_id
-                ).label('loser_id'),
-                func.count(Game.id)
-            )
-            .filter(*base_filters)
-            .filter(Game.winner_team_id.isnot(None))
-            .group_by('loser_id').all()
-        )
-        
-        # Obtener todos los equipos
-        teams_map = {t.id: t for t in session.query(Team).all()}
+        # Victorias y derrotas de cada equipo en una sola agregación: cada equipo se
+        # cruza con sus partidos (local o visitante) y se cuentan ambos casos. El
+        # INNER JOIN descarta los equipos sin partidos en la temporada
+        wins = func.sum(case((Game.winner_team_id == Team.id, 1), else_=0))
+        losses = func.sum(case((Game.winner_team_id != Team.id, 1), else_=0))
+        rows = session.query(
+            Team.id, Team.abbreviation, Team.full_name, Team.conference, Team.division,
+            wins.label('wins'), losses.label('losses')
+        ).join(Game, and_(
+            or_(Game.home_team_id == Team.id, Game.away_team_id == Team.id),
+            Game.status == 3, Game.rs == True, Game.season == season,
+            Game.winner_team_id.isnot(None)
+        )).group_by(Team.id).all()
         
         # Construir tabla de clasificación
         standings = []
-        for team_id, team in teams_map.items():
-            w = wins_stats.get(team_id, 0)
-            l = losses_stats.get(team_id, 0)
-            total = w + l
-            if total == 0:
-                continue  # Equipo sin partidos en esta temporada
-            pct = w / total
+        for row in rows:
+            w = int(row.wins)
+            l = int(row.losses)
             standings.append({
-                'team_id': team_id,
-                'abbreviation': team.abbreviation,
-                'full_name': team.full_name,
-                'conference': team.conference,
-                'division': team.division,
+                'team_id': row.id,
+                'abbreviation': row.abbreviation,
+                'full_name': row.full_name,
+                'conference': row.conference,
+                'division': row.division,
                 'wins': w,
                 'losses': l,
-                'pct': pct,
+                'pct': w / (w + l),
             })
         
         # Separar por conferencia y ordenar por PCT
-        east = sorted([s for s in standings if s['conference'] == 'East'], key=lambda x: x['pct'], reverse=True)
-        west = sorted([s for s in standings if s['conference'] == 'West'], key=lambda x: x['pct'], reverse=True)
+        east = sorted([s for s in standings if s['conference'] == 'East'], key=itemgetter('pct'), reverse=True)
+        west = sorted([s for s in standings if s['conference'] == 'West'], key=itemgetter('pct'), reverse=True)
         
         # Añadir ranking
         for i, s in enumerate(east):
@@ -1083,6 +1423,19 @@ def get_season_standings(season: str, session: Optional[Session] = None) -> Dict
             session.close()
 
 
+# Ronda y posición en el bracket de la NBA Cup según los 4 últimos dígitos del ID
+# de partido (cuartos: 1201-1204, semifinales: 1229-1230)
+_IST_SUFFIX_SLOTS = {
+    '1201': (2, 0), '1202': (2, 1), '1203': (2, 2), '1204': (2, 3),
+    '1229': (3, 0), '1230': (3, 1),
+}
+
+# Números de partido (5 últimos dígitos del ID) de las eliminatorias de la NBA Cup
+# disputadas como temporada regular; un único IN servido por idx_games_ist_season_number
+# en lugar de un LIKE '%...' por sufijo
+_IST_KNOCKOUT_GAME_NUMBERS = tuple('0' + suffix for suffix in _IST_SUFFIX_SLOTS)
+
+
 def _get_bracket_data(games_list: List[Game], is_ist: bool = False) -> Dict[int, List[Dict[str, Any]]]:
     """Función auxiliar para construir datos de bracket desde una lista de partidos.
     
@@ -1090,7 +1443,8 @@ def _get_bracket_data(games_list: List[Game], is_ist: bool = False) -> Dict[int,
     a partir del ID del partido, y construye la estructura de bracket.
     
     Args:
-        games_list: Lista de objetos Game con home_team/away_team cargados
+        games_list: Lista de objetos Game con home_team/away_team cargados, ordenada
+            por fecha ascendente (ORDER BY de la consulta)
         is_ist: True si es NBA Cup (afecta la lógica de parseo de IDs)
         
     Returns:
@@ -1136,31 +1490,25 @@ def _get_bracket_data(games_list: List[Game], is_ist: bool = False) -> Dict[int,
                 s['t2_score'] = g.home_score if g.home_team_id == t2 else g.away_score
                 s['t1_score'] = g.away_score if g.home_team_id == t2 else g.home_score
         
-        if g.date < s['first_date']:
-            s['first_date'] = g.date
-        if g.date > s['last_date']:
-            s['last_date'] = g.date
+        # Los partidos llegan ordenados por fecha desde SQL: la primera fecha queda
+        # fijada al crear la serie y la última es siempre la del partido actual
+        s['last_date'] = g.date
         
         # Detección de ronda y posición basada en Game ID
-        try:
-            if len(g.id) == 10:
-                if is_ist:
-                    if g.id.startswith('006'):
-                        s['r_hint'] = 4
-                        s['r_pos'] = 0
-                    else:
-                        if g.id.endswith('1201'): s['r_pos'] = 0; s['r_hint'] = 2
-                        elif g.id.endswith('1202'): s['r_pos'] = 1; s['r_hint'] = 2
-                        elif g.id.endswith('1203'): s['r_pos'] = 2; s['r_hint'] = 2
-                        elif g.id.endswith('1204'): s['r_pos'] = 3; s['r_hint'] = 2
-                        elif g.id.endswith('1229'): s['r_pos'] = 0; s['r_hint'] = 3
-                        elif g.id.endswith('1230'): s['r_pos'] = 1; s['r_hint'] = 3
+        if len(g.id) == 10:
+            if is_ist:
+                if g.id.startswith('006'):
+                    s['r_hint'] = 4
+                    s['r_pos'] = 0
                 else:
-                    if g.id.startswith('004'):
-                        s['r_hint'] = int(g.id[7])
-                        s['r_pos'] = int(g.id[8])
-        except Exception:
-            pass
+                    slot = _IST_SUFFIX_SLOTS.get(g.id[-4:])
+                    if slot is not None:
+                        s['r_hint'], s['r_pos'] = slot
+            elif g.id.startswith('004'):
+                round_pos = g.id[7:9]
+                if round_pos.isdigit():
+                    s['r_hint'] = int(round_pos[0])
+                    s['r_pos'] = int(round_pos[1])
     
     sorted_series = sorted(series_map.values(), key=lambda x: (x['r_hint'] or 0, x['r_pos']))
     
@@ -1189,6 +1537,20 @@ def _get_bracket_data(games_list: List[Game], is_ist: bool = False) -> Dict[int,
     return rounds_data
 
 
+# Nombres de las rondas de cada bracket
+_PO_ROUND_NAMES = {
+    1: 'Primera Ronda',
+    2: 'Semis de Conferencia',
+    3: 'Finales de Conferencia',
+    4: 'Finales NBA'
+}
+_IST_ROUND_NAMES = {
+    2: 'Cuartos de Final',
+    3: 'Semifinales',
+    4: 'Final (NBA Cup)'
+}
+
+
 def get_playoff_bracket(season: str, session: Optional[Session] = None) -> List[Dict[str, Any]]:
     """Obtiene el bracket de playoffs para una temporada.
     
@@ -1200,30 +1562,27 @@ def get_playoff_bracket(season: str, session: Optional[Session] = None) -> List[
         Cada serie incluye equipos, resultados y fechas.
     """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
+        # selectin: los equipos distintos en una consulta IN, sin repetir las
+        # columnas de Team (dos veces) en cada fila de partido
         po_games = session.query(Game)\
-            .options(joinedload(Game.home_team), joinedload(Game.away_team))\
+            .options(selectinload(Game.home_team), selectinload(Game.away_team))\
             .filter(Game.season == season, Game.po == True, Game.status == 3)\
             .order_by(asc(Game.date)).all()
         
         po_rounds = _get_bracket_data(po_games, is_ist=False)
         
-        round_names = {
-            1: 'Primera Ronda',
-            2: 'Semis de Conferencia',
-            3: 'Finales de Conferencia',
-            4: 'Finales NBA'
-        }
-        
         result = []
         for r_num in sorted(po_rounds.keys()):
             if po_rounds[r_num]:
                 result.append({
                     'round': r_num,
-                    'name': round_names.get(r_num, f'Ronda {r_num}'),
+                    'name': _PO_ROUND_NAMES.get(r_num, f'Ronda {r_num}'),
                     'series': po_rounds[r_num]
                 })
         return result
@@ -1242,18 +1601,18 @@ def get_nba_cup_bracket(season: str, session: Optional[Session] = None) -> List[
         Lista de rondas (Cuartos, Semis, Final), cada una con series.
     """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
         ist_ko_games = session.query(Game)\
-            .options(joinedload(Game.home_team), joinedload(Game.away_team))\
+            .options(selectinload(Game.home_team), selectinload(Game.away_team))\
             .filter(Game.season == season, Game.ist == True, Game.status == 3)\
             .filter(or_(
                 Game.rs == False,
-                Game.id.endswith('01201'), Game.id.endswith('01202'),
-                Game.id.endswith('01203'), Game.id.endswith('01204'),
-                Game.id.endswith('01229'), Game.id.endswith('01230')
+                func.right(Game.id, literal_column('5')).in_(_IST_KNOCKOUT_GAME_NUMBERS)
             ))\
             .order_by(asc(Game.date)).all()
         
@@ -1262,18 +1621,12 @@ def get_nba_cup_bracket(season: str, session: Optional[Session] = None) -> List[
         
         ist_rounds = _get_bracket_data(ist_ko_games, is_ist=True)
         
-        round_names = {
-            2: 'Cuartos de Final',
-            3: 'Semifinales',
-            4: 'Final (NBA Cup)'
-        }
-        
         result = []
         for r_num in sorted(ist_rounds.keys()):
             if ist_rounds[r_num]:
                 result.append({
                     'round': r_num,
-                    'name': round_names.get(r_num, f'Ronda {r_num}'),
+                    'name': _IST_ROUND_NAMES.get(r_num, f'Ronda {r_num}'),
                     'series': ist_rounds[r_num]
                 })
         return result
@@ -1293,7 +1646,7 @@ def get_team_roster(
 ) -> Dict[str, Any]:
     """Obtiene el roster de un equipo para una temporada específica.
     
-    Deduplica jugadores que aparecen en múltiples tipos de competición
+    Deduplica en SQL los jugadores que aparecen en múltiples tipos de competición
     (Regular Season, Playoffs, NBA Cup), priorizando Regular Season.
     
     Args:
@@ -1304,6 +1657,8 @@ def get_team_roster(
         Dict con team_id, season y lista de jugadores del roster.
     """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
@@ -1319,30 +1674,38 @@ def get_team_roster(
             else:
                 return {'team_id': team_id, 'season': None, 'count': 0, 'players': []}
         
-        roster_raw = session.query(PlayerTeamSeason)\
-            .options(joinedload(PlayerTeamSeason.player))\
-            .filter(
-                PlayerTeamSeason.team_id == team_id,
-                PlayerTeamSeason.season == season
-            ).all()
-        
-        # Deduplicar: preferir 'Regular Season' o la entrada con más partidos
-        roster_dict = {}
-        for pts in roster_raw:
-            pid = pts.player_id
-            if pid not in roster_dict:
-                roster_dict[pid] = pts
-            else:
-                existing = roster_dict[pid]
-                if pts.type == 'Regular Season':
-                    roster_dict[pid] = pts
-                elif existing.type != 'Regular Season' and (pts.games_played or 0) > (existing.games_played or 0):
-                    roster_dict[pid] = pts
+        # Deduplicación en SQL: ROW_NUMBER por jugador se queda con una fila,
+        # prefiriendo 'Regular Season' y después la de más partidos
+        ranked = session.query(
+            PlayerTeamSeason.id,
+            func.row_number().over(
+                partition_by=PlayerTeamSeason.player_id,
+                order_by=(case((PlayerTeamSeason.type == 'Regular Season', 0), else_=1),
+                          desc(func.coalesce(PlayerTeamSeason.games_played, 0)))
+            ).label('rn')
+        ).filter(
+            PlayerTeamSeason.team_id == team_id,
+            PlayerTeamSeason.season == season
+        ).subquery()
+        best_ids = select(ranked.c.id).where(ranked.c.rn == 1)
+        
+        # Filas elegidas ya ordenadas por nombre; solo las columnas que usa el roster
+        # (sin tiros, defensa ni metadatos)
+        roster = session.query(PlayerTeamSeason)\
+            .join(PlayerTeamSeason.player)\
+            .options(
+                load_only(PlayerTeamSeason.player_id, PlayerTeamSeason.type,
+                          PlayerTeamSeason.games_played, PlayerTeamSeason.minutes,
+                          PlayerTeamSeason.pts, PlayerTeamSeason.reb, PlayerTeamSeason.ast),
+                contains_eager(PlayerTeamSeason.player).load_only(
+                    Player.id, Player.full_name, Player.position, Player.jersey,
+                    Player.height, Player.weight, Player.country, Player.is_active),
+            )\
+            .filter(PlayerTeamSeason.id.in_(best_ids))\
+            .order_by(Player.full_name).all()
         
         players = []
-        for pts in sorted(roster_dict.values(), key=lambda x: x.player.full_name if x.player else ''):
-            if not pts.player:
-                continue
+        for pts in roster:
             p = pts.player
             n = pts.games_played or 1
             total_mins = pts.minutes.total_seconds() / 60 if pts.minutes else 0
@@ -1388,12 +1751,117 @@ def _parse_height_inches(h: str, default: int = 0) -> int:
         Altura en pulgadas totales, o default si falla
     """
     try:
-        parts = h.split('-')
-        return int(parts[0]) * 12 + int(parts[1])
-    except Exception:
+        # partition no construye la lista completa; se ignora lo que siga a las pulgadas
+        feet, sep, rest = h.partition('-')
+        if not sep:
+            return default
+        return int(feet) * 12 + int(rest.partition('-')[0])
+    except (ValueError, AttributeError):
         return default
 
 
+# Altura "pies-pulgadas" (ej: '6-9') convertida a pulgadas en SQL para los rankings
+# tallest/shortest; solo se aplica a filas que cumplen _HEIGHT_PATTERN
+_HEIGHT_PATTERN = r'^[0-9]+-[0-9]+$'
+_HEIGHT_INCHES = (
+    cast(func.split_part(Player.height, '-', 1), Integer) * 12 +
+    cast(func.split_part(Player.height, '-', 2), Integer)
+)
+
+
+def _detail_position_country(p) -> str:
+    return f"{p.position or 'N/A'} | {p.country or 'N/A'}"
+
+
+def _detail_height_position(p) -> str:
+    return f"{p.height or 'N/A'} | {p.position or 'N/A'}"
+
+
+def _detail_experience(p) -> str:
+    return f"Desde {p.from_year or '?'} | {p.position or 'N/A'}"
+
+
+def _detail_draft(p) -> str:
+    return f"Draft {p.draft_year or '?'} Ronda {p.draft_round or '?'}"
+
+
+class _iso_date(FunctionElement):
+    """Fecha formateada como 'YYYY-MM-DD' en la propia BD (sin construir datetime.date)."""
+    type = String()
+    inherit_cache = True
+
+
+@compiles(_iso_date, 'postgresql')
+def _compile_iso_date_postgresql(element, compiler, **kw):
+    return compiler.process(func.to_char(*element.clauses, 'YYYY-MM-DD'), **kw)
+
+
+@compiles(_iso_date, 'sqlite')
+def _compile_iso_date_sqlite(element, compiler, **kw):
+    return compiler.process(func.strftime('%Y-%m-%d', *element.clauses), **kw)
+
+
+@compiles(_iso_date)
+def _compile_iso_date(element, compiler, **kw):
+    return compiler.process(cast(*element.clauses, String), **kw)
+
+
+# Especificación de cada criterio de get_player_rankings:
+# - columns: columnas de Player que se leen además de id y nombre
+# - filters: condiciones de validez del valor
+# - order_by: orden del Top-K (None en tallest/shortest: depende del dialecto)
+# - value/detail: construyen los campos del resultado a partir del jugador
+_RankingSpec = namedtuple('_RankingSpec', ['columns', 'filters', 'order_by', 'value', 'detail'])
+
+_RANKING_CRITERIA = {
+    'youngest': _RankingSpec(
+        (_iso_date(Player.birthdate).label('birthdate'), Player.position, Player.country),
+        (Player.birthdate.isnot(None),),
+        (desc(Player.birthdate),),
+        attrgetter('birthdate'), _detail_position_country),
+    'oldest': _RankingSpec(
+        (_iso_date(Player.birthdate).label('birthdate'), Player.position, Player.country),
+        (Player.birthdate.isnot(None),),
+        (asc(Player.birthdate),),
+        attrgetter('birthdate'), _detail_position_country),
+    'heaviest': _RankingSpec(
+        (Player.weight, Player.height, Player.position),
+        (Player.weight.isnot(None), Player.weight > 0),
+        (desc(Player.weight),),
+        attrgetter('weight'), _detail_height_position),
+    'lightest': _RankingSpec(
+        (Player.weight, Player.height, Player.position),
+        (Player.weight.isnot(None), Player.weight > 0),
+        (asc(Player.weight),),
+        attrgetter('weight'), _detail_height_position),
+    'most_experienced': _RankingSpec(
+        (Player.season_exp, Player.from_year, Player.position),
+        (Player.season_exp.isnot(None),),
+        (desc(Player.season_exp),),
+        attrgetter('season_exp'), _detail_experience),
+    'highest_draft_pick': _RankingSpec(
+        (Player.draft_number, Player.draft_year, Player.draft_round),
+        (Player.draft_number.isnot(None), Player.draft_number > 0),
+        (asc(Player.draft_number), desc(Player.draft_year)),
+        attrgetter('draft_number'), _detail_draft),
+    'lowest_draft_pick': _RankingSpec(
+        (Player.draft_number, Player.draft_year, Player.draft_round),
+        (Player.draft_number.isnot(None), Player.draft_number > 0),
+        (desc(Player.draft_number), desc(Player.draft_year)),
+        attrgetter('draft_number'), _detail_draft),
+    'tallest': _RankingSpec(
+        (Player.height, Player.position, Player.country),
+        (Player.height.isnot(None),),
+        None,
+        attrgetter('height'), _detail_position_country),
+    'shortest': _RankingSpec(
+        (Player.height, Player.position, Player.country),
+        (Player.height.isnot(None),),
+        None,
+        attrgetter('height'), _detail_position_country),
+}
+
+
 def get_player_rankings(
     criteria: str,
     active_only: bool = True,
@@ -1420,96 +1888,51 @@ def get_player_rankings(
         Lista de dicts con id, full_name, value y detail
     """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
+        spec = _RANKING_CRITERIA.get(criteria)
+        if spec is None:
+            return []
+        
         limit = min(limit, 50)
-        query = session.query(Player)
+        # Filas de columnas, no entidades: solo id y nombre más lo que leen valor y detalle
+        query = session.query(Player.id, Player.full_name, *spec.columns)\
+            .filter(*spec.filters)
         
         if active_only:
             query = query.filter(Player.is_active == True)
         
-        if criteria == 'youngest':
-            query = query.filter(Player.birthdate.isnot(None))
-            query = query.order_by(desc(Player.birthdate))
-        elif criteria == 'oldest':
-            query = query.filter(Player.birthdate.isnot(None))
-            query = query.order_by(asc(Player.birthdate))
-        elif criteria == 'heaviest':
-            query = query.filter(Player.weight.isnot(None), Player.weight > 0)
-            query = query.order_by(desc(Player.weight))
-        elif criteria == 'lightest':
-            query = query.filter(Player.weight.isnot(None), Player.weight > 0)
-            query = query.order_by(asc(Player.weight))
-        elif criteria == 'most_experienced':
-            query = query.filter(Player.season_exp.isnot(None))
-            query = query.order_by(desc(Player.season_exp))
-        elif criteria == 'highest_draft_pick':
-            query = query.filter(Player.draft_number.isnot(None), Player.draft_number > 0)
-            query = query.order_by(asc(Player.draft_number), desc(Player.draft_year))
-        elif criteria == 'lowest_draft_pick':
-            query = query.filter(Player.draft_number.isnot(None), Player.draft_number > 0)
-            query = query.order_by(desc(Player.draft_number), desc(Player.draft_year))
-        elif criteria == 'tallest':
-            # height está como string "6-9", necesitamos ordenar por conversión
-            query = query.filter(Player.height.isnot(None))
-            players_all = query.all()
-            
-            players_sorted = sorted(players_all, key=lambda p: _parse_height_inches(p.height, default=0), reverse=True)[:limit]
-            return [
-                {
-                    'id': p.id,
-                    'full_name': p.full_name,
-                    'value': p.height,
-                    'detail': f"{p.position or 'N/A'} | {p.country or 'N/A'}",
-                }
-                for p in players_sorted
-            ]
-        elif criteria == 'shortest':
-            query = query.filter(Player.height.isnot(None))
-            players_all = query.all()
-            
-            players_sorted = sorted(players_all, key=lambda p: _parse_height_inches(p.height, default=999))[:limit]
-            return [
-                {
-                    'id': p.id,
-                    'full_name': p.full_name,
-                    'value': p.height,
-                    'detail': f"{p.position or 'N/A'} | {p.country or 'N/A'}",
-                }
-                for p in players_sorted
-            ]
+        if spec.order_by is not None:
+            players = query.order_by(*spec.order_by).limit(limit).all()
+        elif session.get_bind().dialect.name == 'postgresql':
+            # height es un string "6-9": la conversión a pulgadas y el Top-K se hacen
+            # en SQL (solo viajan `limit` filas). Las alturas sin formato válido se
+            # excluyen antes de convertir
+            order = desc if criteria == 'tallest' else asc
+            players = query.filter(Player.height.op('~')(_HEIGHT_PATTERN))\
+                .order_by(order(_HEIGHT_INCHES)).limit(limit).all()
         else:
-            return []
-        
-        # Para criterios que no requieren parsing especial
-        players = query.limit(limit).all()
+            # Sin regex ni split_part (ej: SQLite): Top-K en Python sobre un cursor
+            # por lotes; en memoria solo queda el heap de `limit` jugadores
+            pick = heapq.nlargest if criteria == 'tallest' else heapq.nsmallest
+            rows = query.yield_per(1000)
+            players = pick(
+                limit,
+                (p for p in rows if _parse_height_inches(p.height, 0) > 0),
+                key=lambda p: _parse_height_inches(p.height, 0)
+            )
         
-        results = []
-        for p in players:
-            if criteria in ('youngest', 'oldest'):
-                value = p.birthdate.isoformat() if p.birthdate else None
-                detail = f"{p.position or 'N/A'} | {p.country or 'N/A'}"
-            elif criteria in ('heaviest', 'lightest'):
-                value = p.weight
-                detail = f"{p.height or 'N/A'} | {p.position or 'N/A'}"
-            elif criteria == 'most_experienced':
-                value = p.season_exp
-                detail = f"Desde {p.from_year or '?'} | {p.position or 'N/A'}"
-            elif criteria in ('highest_draft_pick', 'lowest_draft_pick'):
-                value = p.draft_number
-                detail = f"Draft {p.draft_year or '?'} Ronda {p.draft_round or '?'}"
-            else:
-                value = None
-                detail = None
-            
-            results.append({
-                'id': p.id,
-                'full_name': p.full_name,
-                'value': value,
-                'detail': detail,
-            })
+        value_fn, detail_fn = spec.value, spec.detail
+        results = [{
+            'id': p.id,
+            'full_name': p.full_name,
+            'value': value_fn(p),
+            'detail': detail_fn(p),
+        } for p in players]
         
         return results
     finally:
@@ -1536,18 +1959,30 @@ def get_award_leaders(
         Lista de dicts con id, full_name, count, seasons
     """
     own_session = False
+    if session is None:
+        session = current_session()
     if session is None:
         session = get_session()
         own_session = True
     try:
         limit = min(limit, 50)
         
-        # Contar premios por jugador
+        is_postgresql = session.get_bind().dialect.name == 'postgresql'
+        if is_postgresql:
+            # Temporadas distintas ya ordenadas (más reciente primero) en la misma consulta
+            seasons_col = func.array_agg(
+                aggregate_order_by(PlayerAward.season.distinct(), PlayerAward.season.desc())
+            )
+        else:
+            seasons_col = func.group_concat(PlayerAward.season.distinct())
+        
+        # Contar premios por jugador y agregar sus temporadas (una sola consulta)
         query = session.query(
             Player.id,
             Player.full_name,
             Player.is_active,
             func.count(PlayerAward.id).label('award_count'),
+            seasons_col.label('seasons'),
         ).join(PlayerAward, Player.id == PlayerAward.player_id)
         
         if award_type:
@@ -1560,30 +1995,12 @@ def get_award_leaders(
             .order_by(desc('award_count'))\
             .limit(limit)
         
-        results_raw = query.all()
-        
-        if not results_raw:
-            return []
-        
-        # Obtener todas las temporadas de premios en una sola query (evitar N+1)
-        player_ids = [r.id for r in results_raw]
-        seasons_query = session.query(
-            PlayerAward.player_id,
-            PlayerAward.season
-        ).filter(PlayerAward.player_id.in_(player_ids))
-        if award_type:
-            seasons_query = seasons_query.filter(PlayerAward.award_type == award_type)
-        seasons_query = seasons_query.distinct()
-        
-        # Agrupar temporadas por jugador
-        player_seasons = {}
-        for pid, season in seasons_query.all():
-            player_seasons.setdefault(pid, []).append(season)
-        
-        # Construir resultados
         results = []
-        for r in results_raw:
-            seasons = sorted(player_seasons.get(r.id, []), reverse=True)
+        for r in query.all():
+            if is_postgresql:
+                seasons = r.seasons
+            else:
+                seasons = sorted(r.seasons.split(','), reverse=True) if r.seasons else []
             
             results.append({
                 'id': r.id,
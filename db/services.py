@@ -1,63 +1,128 @@
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Iterable
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from db.models import Team, Player
 from db.constants import SPECIAL_EVENT_TEAM_IDS
 
+# Equipos estáticos de nba_api indexados por ID (carga perezosa, una vez por proceso)
+_NBA_TEAMS_BY_ID: Optional[Dict[int, Dict[str, Any]]] = None
+_NBA_TEAMS_LOCK = threading.Lock()
+
+
+def _nba_teams_by_id() -> Dict[int, Dict[str, Any]]:
+    """Retorna los equipos de nba_api por ID; vacío si nba_api no está disponible."""
+    global _NBA_TEAMS_BY_ID
+    if _NBA_TEAMS_BY_ID is None:
+        with _NBA_TEAMS_LOCK:
+            if _NBA_TEAMS_BY_ID is None:
+                try:
+                    from nba_api.stats.static import teams as nba_teams_static
+                    _NBA_TEAMS_BY_ID = {t['id']: t for t in nba_teams_static.get_teams()}
+                except ImportError:
+                    _NBA_TEAMS_BY_ID = {}
+    return _NBA_TEAMS_BY_ID
+
+
+def _is_postgresql(session: Session) -> bool:
+    """Indica si la sesión está ligada a PostgreSQL."""
+    return session.get_bind().dialect.name == 'postgresql'
+
+
+def _insert_or_get(session: Session, model, values: Dict[str, Any]):
+    """Crea una fila con INSERT ... ON CONFLICT DO NOTHING RETURNING (PostgreSQL).
+
+    Una sola sentencia, sin SAVEPOINT ni rollback: si otro worker la creó justo
+    antes, no se devuelve nada y se lee la existente.
+    """
+    stmt = pg_insert(model).values(**values)\
+        .on_conflict_do_nothing(index_elements=['id'])\
+        .returning(model)
+    obj = session.execute(stmt).scalar()
+    if obj is None:
+        obj = session.get(model, values['id'])
+    return obj
+
+
 def is_valid_team_id(team_id: int, allow_special_events: bool = False, session: Optional[Session] = None) -> bool:
     """Verifica si un team_id es válido."""
     if allow_special_events and team_id in SPECIAL_EVENT_TEAM_IDS: return True
-    if session and session.query(Team).filter(Team.id == team_id).first(): return True
-    try:
-        from nba_api.stats.static import teams as nba_teams_static
-        if any(t['id'] == team_id for t in nba_teams_static.get_teams()): return True
-    except: pass
-    return 1610612737 <= team_id <= 1610612766
+    # Caso habitual primero: rango de IDs de franquicias NBA (sin BD ni nba_api)
+    if 1610612737 <= team_id <= 1610612766: return True
+    if session and session.get(Team, team_id) is not None: return True
+    return team_id in _nba_teams_by_id()
+
+
+def prime_player_cache(session: Session, player_ids: Iterable[int]) -> Dict[int, Player]:
+    """Carga en una sola consulta los jugadores existentes de un lote, indexados por ID."""
+    ids = list(set(player_ids))
+    if not ids:
+        return {}
+    return {p.id: p for p in session.query(Player).filter(Player.id.in_(ids)).all()}
 
 
 def get_or_create_team(session: Session, team_id: int, team_data: Optional[Dict[str, Any]] = None) -> Team:
     """Obtiene un equipo de la BD o lo crea si no existe."""
-    team = session.query(Team).filter(Team.id == team_id).first()
+    team = session.get(Team, team_id)
     if team:
         if team_data:
             for k, v in team_data.items():
                 if v and hasattr(team, k): setattr(team, k, v)
         return team
     
-    # Intento de creación atómico para evitar race conditions
-    savepoint = session.begin_nested()
-    try:
-        final_data = team_data.copy() if team_data else {}
-        if not final_data.get('full_name') or not final_data.get('abbreviation'):
-            try:
-                from nba_api.stats.static import teams as nba_teams_static
-                for t in nba_teams_static.get_teams():
-                    if t['id'] == team_id:
-                        if not final_data.get('full_name'): final_data['full_name'] = t['full_name']
-                        if not final_data.get('abbreviation'): final_data['abbreviation'] = t['abbreviation']
-                        if not final_data.get('city'): final_data['city'] = t['city']
-                        if not final_data.get('nickname'): final_data['nickname'] = t['nickname']
-                        break
-            except: pass
-
-        if not final_data.get('abbreviation'):
-            final_data['abbreviation'] = f"TM_{team_id}"
-        if not final_data.get('full_name'):
-            final_data['full_name'] = f"Team {team_id}"
-
-        new_team = Team(id=team_id, **final_data)
-        session.add(new_team)
-        session.flush()
-        savepoint.commit()
-        return new_team
-    except Exception:
-        savepoint.rollback()
-        # Si falló, es que otro worker lo creó justo antes
-        return session.query(Team).filter(Team.id == team_id).first()
-
-
-def get_or_create_player(session: Session, player_id: int, player_data: Optional[Dict[str, Any]] = None) -> Player:
-    """Obtiene un jugador de la BD o lo crea si no existe."""
-    player = session.query(Player).filter(Player.id == player_id).first()
+    final_data = team_data.copy() if team_data else {}
+    if not final_data.get('full_name') or not final_data.get('abbreviation'):
+        t = _nba_teams_by_id().get(team_id)
+        if t:
+            if not final_data.get('full_name'): final_data['full_name'] = t['full_name']
+            if not final_data.get('abbreviation'): final_data['abbreviation'] = t['abbreviation']
+            if not final_data.get('city'): final_data['city'] = t['city']
+            if not final_data.get('nickname'): final_data['nickname'] = t['nickname']
+
+    if not final_data.get('abbreviation'):
+        final_data['abbreviation'] = f"TM_{team_id}"
+    if not final_data.get('full_name'):
+        final_data['full_name'] = f"Team {team_id}"
+
+    if _is_postgresql(session):
+        new_team = _insert_or_get(session, Team, {'id': team_id, **final_data})
+    else:
+        # Intento de creación atómico para evitar race conditions
+        savepoint = session.begin_nested()
+        try:
+            new_team = Team(id=team_id, **final_data)
+            session.add(new_team)
+            session.flush()
+            savepoint.commit()
+        except IntegrityError:
+            savepoint.rollback()
+            # Si falló, es que otro worker lo creó justo antes
+            new_team = session.get(Team, team_id)
+    return new_team
+
+
+def get_or_create_player(
+    session: Session,
+    player_id: int,
+    player_data: Optional[Dict[str, Any]] = None,
+    cache: Optional[Dict[int, Player]] = None
+) -> Player:
+    """Obtiene un jugador de la BD o lo crea si no existe.
+
+    Con `cache` (ver prime_player_cache) un ID ya presente no consulta la BD, y los
+    jugadores creados se añaden al cache.
+    """
+    if cache is not None and player_id in cache:
+        player = cache[player_id]
+    elif cache is not None:
+        # Lote precargado: un ID ausente no existía al cargarlo
+        player = None
+    else:
+        # Sin autoflush: la búsqueda no vuelca las estadísticas pendientes del lote
+        with session.no_autoflush:
+            player = session.get(Player, player_id)
     
     if player:
         if player_data:
@@ -66,24 +131,83 @@ def get_or_create_player(session: Session, player_id: int, player_data: Optional
                     setattr(player, k, v)
         return player
 
-    # Intento de creación atómico
-    savepoint = session.begin_nested()
-    try:
-        # Creación rápida sin llamada a API de biografía (se delega a la fase final)
-        name = player_data.get('full_name') if player_data else f'Player {player_id}'
-        new_player = Player(id=player_id, full_name=name)
-        
-        # Si vienen datos en player_data (como jersey o posición del boxscore), los usamos
-        if player_data:
-            for k in ['position', 'jersey']:
-                if k in player_data and player_data[k] is not None:
-                    setattr(new_player, k, player_data[k])
-                    
-        session.add(new_player)
-        session.flush()
-        savepoint.commit()
-        return new_player
-    except Exception:
-        savepoint.rollback()
-        # Si falló, es que otro worker lo creó justo antes
-        return session.query(Player).filter(Player.id == player_id).first()
+    # Creación rápida sin llamada a API de biografía (se delega a la fase final)
+    name = player_data.get('full_name') if player_data else f'Player {player_id}'
+    values = {'id': player_id, 'full_name': name}
+    
+    # Si vienen datos en player_data (como jersey o posición del boxscore), los usamos
+    if player_data:
+        for k in ['position', 'jersey']:
+            if k in player_data and player_data[k] is not None:
+                values[k] = player_data[k]
+
+    if _is_postgresql(session):
+        new_player = _insert_or_get(session, Player, values)
+    else:
+        # Intento de creación atómico
+        savepoint = session.begin_nested()
+        try:
+            new_player = Player(**values)
+            session.add(new_player)
+            session.flush()
+            savepoint.commit()
+        except IntegrityError:
+            savepoint.rollback()
+            # Si falló, es que otro worker lo creó justo antes
+            new_player = session.get(Player, player_id)
+    if cache is not None and new_player is not None:
+        cache[player_id] = new_player
+    return new_player
+
+
+def bulk_get_or_create_players(
+    session: Session,
+    rows: Dict[int, Dict[str, Any]]
+) -> Dict[int, Player]:
+    """Obtiene o crea en bloque los jugadores de un lote (ej: un boxscore).
+
+    Alternativa a llamar a get_or_create_player por fila: en PostgreSQL es un único
+    INSERT ... ON CONFLICT DO UPDATE RETURNING para todo el lote. En los jugadores
+    existentes solo se actualizan position y jersey (los None no sobrescriben); el
+    nombre no se toca, de modo que el provisional `Player {id}` de los nuevos nunca
+    reemplaza al real.
+
+    Args:
+        rows: Dict player_id -> datos (full_name, position, jersey)
+
+    Returns:
+        Dict player_id -> Player
+    """
+    if not rows:
+        return {}
+
+    if not _is_postgresql(session):
+        cache = prime_player_cache(session, rows)
+        players = {}
+        for pid, data in rows.items():
+            if pid in cache:
+                player = cache[pid]
+                for k in ('position', 'jersey'):
+                    if data.get(k) is not None:
+                        setattr(player, k, data[k])
+                players[pid] = player
+            else:
+                players[pid] = get_or_create_player(session, pid, data, cache=cache)
+        return players
+
+    values_list = [{
+        'id': pid,
+        'full_name': data.get('full_name') or f'Player {pid}',
+        'position': data.get('position'),
+        'jersey': data.get('jersey'),
+    } for pid, data in rows.items()]
+    stmt = pg_insert(Player).values(values_list)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['id'],
+        set_={
+            k: func.coalesce(getattr(stmt.excluded, k), getattr(Player, k))
+            for k in ('position', 'jersey')
+        }
+    ).returning(Player)
+    players = session.scalars(stmt, execution_options={'populate_existing': True})
+    return {p.id: p for p in players}
@@ -4,65 +4,59 @@ Este módulo proporciona funciones simples para obtener y mostrar
 el conteo de registros en cada tabla de la base de datos.
 """
 
-import sys
-from pathlib import Path
 from typing import Dict
 
-# Agregar el directorio raíz al PYTHONPATH
-project_root = Path(__file__).parent.parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+from sqlalchemy import func, select
 
 from db import get_session
 from db.models import (
     Team, Player, Game, PlayerGameStats, TeamGameStats,
-    PlayerTeamSeason, PlayerAward
+    PlayerTeamSeason, PlayerAward, PlayerCareerHigh
 )
 
 
+# Tablas incluidas en el resumen (clave del resultado -> modelo)
+_COUNTED_MODELS = {
+    'teams': Team,
+    'players': Player,
+    'games': Game,
+    'player_game_stats': PlayerGameStats,
+    'team_game_stats': TeamGameStats,
+    'player_team_seasons': PlayerTeamSeason,
+    'player_awards': PlayerAward,
+    'player_career_highs': PlayerCareerHigh,
+}
+
+# Filas del resumen (nombre legible, clave) en orden alfabético de tabla y ancho de
+# la columna de nombres: el conjunto de tablas es fijo, se calculan al importar
+_SUMMARY_ROWS = tuple((name.replace('_', ' ').title(), name) for name in sorted(_COUNTED_MODELS))
+_LABEL_WIDTH = max(len(name) for name in _COUNTED_MODELS) + 5
+_BANNER = "=" * 70
+_SEPARATOR = "-" * 70
+
+
 def get_record_counts() -> Dict[str, int]:
     """Obtiene el número de registros en cada tabla de la base de datos.
     
+    Todos los conteos viajan en una sola consulta (un count(*) escalar por tabla).
+    
     Returns:
         Diccionario con el nombre de la tabla como clave y el conteo como valor
     """
     session = get_session()
     try:
-        return {
-            'teams': session.query(Team).count(),
-            'players': session.query(Player).count(),
-            'games': session.query(Game).count(),
-            'player_game_stats': session.query(PlayerGameStats).count(),
-            'team_game_stats': session.query(TeamGameStats).count(),
-            'player_team_seasons': session.query(PlayerTeamSeason).count(),
-            'player_awards': session.query(PlayerAward).count(),
-        }
+        stmt = select(*[
+            select(func.count()).select_from(model).scalar_subquery().label(name)
+            for name, model in _COUNTED_MODELS.items()
+        ])
+        return dict(session.execute(stmt).one()._mapping)
     finally:
         session.close()
 
 
 def print_summary():
     """Imprime un resumen visual del número de registros en cada tabla."""
-    counts = get_record_counts()
-    
-    # Calcular el total
-    total = sum(counts.values())
-    
-    # Encontrar el ancho máximo del nombre de tabla para alineación
-    max_table_name_width = max(len(name) for name in counts.keys())
-    
-    print("\n" + "=" * 70)
-    print("RESUMEN DE REGISTROS EN LA BASE DE DATOS")
-    print("=" * 70)
-    
-    for table_name, count in sorted(counts.items()):
-        # Formatear el nombre de la tabla de forma más legible
-        display_name = table_name.replace('_', ' ').title()
-        print(f"  {display_name:<{max_table_name_width + 5}} {count:>12,}")
-    
-    print("-" * 70)
-    print(f"  {'TOTAL':<{max_table_name_width + 5}} {total:>12,}")
-    print("=" * 70 + "\n")
+    print("\n" + get_summary_string() + "\n")
 
 
 def get_summary_string() -> str:
@@ -72,21 +66,12 @@ def get_summary_string() -> str:
         String con el resumen formateado
     """
     counts = get_record_counts()
-    total = sum(counts.values())
-    
-    max_table_name_width = max(len(name) for name in counts.keys())
-    
-    lines = []
-    lines.append("=" * 70)
-    lines.append("RESUMEN DE REGISTROS EN LA BASE DE DATOS")
-    lines.append("=" * 70)
-    
-    for table_name, count in sorted(counts.items()):
-        display_name = table_name.replace('_', ' ').title()
-        lines.append(f"  {display_name:<{max_table_name_width + 5}} {count:>12,}")
     
-    lines.append("-" * 70)
-    lines.append(f"  {'TOTAL':<{max_table_name_width + 5}} {total:>12,}")
-    lines.append("=" * 70)
+    lines = [_BANNER, "RESUMEN DE REGISTROS EN LA BASE DE DATOS", _BANNER]
+    for display_name, table_name in _SUMMARY_ROWS:
+        lines.append(f"  {display_name:<{_LABEL_WIDTH}} {counts[table_name]:>12,}")
+    lines.append(_SEPARATOR)
+    lines.append(f"  {'TOTAL':<{_LABEL_WIDTH}} {sum(counts.values()):>12,}")
+    lines.append(_BANNER)
     
     return "\n".join(lines)
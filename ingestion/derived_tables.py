@@ -3,6 +3,7 @@
 Este módulo maneja la generación y actualización de tablas agregadas:
 - PlayerTeamSeason: Resúmenes de jugadores por equipo/temporada/tipo
 - TeamGameStats: Estadísticas de equipo por partido
+- PlayerCareerHigh: Récords de carrera precalculados por jugador
 - Sincronización de marcadores faltantes
 - Actualización de campeones
 """
@@ -11,10 +12,13 @@ import logging
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from db.models import (
-    PlayerGameStats, PlayerTeamSeason, TeamGameStats, Game
+    PlayerGameStats, PlayerTeamSeason, TeamGameStats, Game, PlayerCareerHigh
 )
+from db.query import get_career_highs_bulk
 from ingestion.models_sync import update_champions
 from ingestion.utils import safe_int, safe_float
 from db.logging import log_step, log_success
@@ -48,6 +52,10 @@ class DerivedTablesGenerator:
         for season in seasons:
             self._regenerate_season(session, season)
         
+        # Récords de carrera: una sola pasada para la unión de jugadores afectados
+        highs_count = self._regenerate_player_career_highs(session, seasons)
+        logger.info(f"{highs_count} PlayerCareerHigh regenerados")
+        
         logger.debug(f"Regeneración completada para {len(seasons)} temporadas")
     
     def regenerate_all(self, session: Session):
@@ -61,6 +69,8 @@ class DerivedTablesGenerator:
         """
         log_step("Regenerando TODAS las tablas derivadas")
         self._regenerate_season(session, season=None)
+        highs_count = self._regenerate_player_career_highs(session)
+        logger.info(f"{highs_count} PlayerCareerHigh regenerados")
         log_success("Regeneración completa finalizada")
     
     def _regenerate_season(self, session: Session, season: Optional[str] = None):
@@ -96,7 +106,7 @@ class DerivedTablesGenerator:
         # 4. Sincronizar marcadores faltantes o discrepantes
         scores_synced = self._sync_missing_scores(session, season)
         
-        # 6. Actualizar campeones
+        # 5. Actualizar campeones
         if season:
             update_champions(session, season)
         
@@ -292,6 +302,63 @@ class DerivedTablesGenerator:
         session.commit()
         return tgs_count
     
+    def _regenerate_player_career_highs(self, session: Session, seasons: Optional[List[str]] = None,
+                                        batch_size: int = 500) -> int:
+        """Regenera tabla PlayerCareerHigh para los jugadores con partidos en las temporadas.
+        
+        Los récords son de toda la carrera, así que se recalculan completos una sola
+        vez por jugador afectado (por lotes, dos consultas por lote). Cada lote se
+        escribe con un INSERT ... ON CONFLICT DO UPDATE y se confirma por separado:
+        los workers de temporadas en paralelo comparten jugadores, y recorrerlos en
+        orden de ID hace que tomen los bloqueos de fila en el mismo orden.
+        
+        Args:
+            session: Sesión de SQLAlchemy
+            seasons: Temporadas afectadas o None para todas
+            batch_size: Jugadores por lote
+            
+        Returns:
+            Número de registros creados/actualizados
+        """
+        p_query = session.query(PlayerGameStats.player_id).distinct()
+        if seasons:
+            p_query = p_query.join(Game, PlayerGameStats.game_id == Game.id).filter(Game.season.in_(seasons))
+        player_ids = [pid for (pid,) in p_query.order_by(PlayerGameStats.player_id).all()]
+        
+        # Mismo upsert en PostgreSQL y en SQLite (tests)
+        insert = pg_insert if session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        
+        highs_count = 0
+        for i in range(0, len(player_ids), batch_size):
+            batch = player_ids[i:i + batch_size]
+            highs_by_player = get_career_highs_bulk(batch, session=session)
+            
+            rows = []
+            for pid, highs in highs_by_player.items():
+                row = {'player_id': pid}
+                for key, value in highs.items():
+                    if hasattr(PlayerCareerHigh, f'{key}_game_id'):
+                        # Récord: valor + partido en que se logró
+                        row[key] = value['value'] if value else None
+                        row[f'{key}_game_id'] = value['game_id'] if value else None
+                    else:
+                        row[key] = value
+                rows.append(row)
+            if not rows:
+                continue
+            
+            stmt = insert(PlayerCareerHigh).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['player_id'],
+                set_={c.name: stmt.excluded[c.name]
+                      for c in PlayerCareerHigh.__table__.columns if c.name != 'player_id'}
+            )
+            session.execute(stmt)
+            session.commit()
+            highs_count += len(rows)
+        
+        return highs_count
+    
     def _sync_missing_scores(self, session: Session, season: Optional[str] = None) -> int:
         """Sincroniza marcadores faltantes desde TeamGameStats.
         
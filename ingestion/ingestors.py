@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
 from db.models import Game, PlayerGameStats
-from db.services import get_or_create_player
+from db.services import bulk_get_or_create_players
 from ingestion.api_client import NBAApiClient
 from ingestion.checkpoints import CheckpointManager
 from ingestion.config import API_DELAY
@@ -189,6 +189,9 @@ class GameIngestion:
     
     def _process_player_stats(self, session, game_id, df, game_exists, name_fallback):
         """Procesa estadísticas de jugadores."""
+        # Primera pasada: filas válidas y nombre de cada jugador del boxscore
+        valid_rows = []
+        players_data = {}
         for _, row in df.iterrows():
             try:
                 player_id = safe_int(self._get_col(row, 'personId', 'PLAYER_ID', 'playerId'), default=-1)
@@ -216,8 +219,19 @@ class GameIngestion:
                 if not player_name or player_name.strip() == '':
                     player_name = name_fallback.get(player_id, f"Player {player_id}")
                 
-                get_or_create_player(session, player_id, {'full_name': player_name})
+                players_data[player_id] = {'full_name': player_name}
+                valid_rows.append((row, player_id, team_id, player_min))
                 
+            except FatalIngestionError: raise
+            except Exception as e:
+                logger.error(f"Error procesando fila de stats en {game_id}: {e}")
+                continue
+        
+        # Jugadores del boxscore creados en bloque (un solo INSERT ... ON CONFLICT en PostgreSQL)
+        bulk_get_or_create_players(session, players_data)
+        
+        for row, player_id, team_id, player_min in valid_rows:
+            try:
                 existing_stat = session.query(PlayerGameStats).filter(
                     and_(PlayerGameStats.game_id == game_id, PlayerGameStats.player_id == player_id)
                 ).first()
@@ -6,7 +6,7 @@ import time
 import sys
 from typing import List, Callable, Any, Dict, Tuple
 
-from db.logging import setup_logging
+from db.logging import setup_logging, stop_db_logging
 from ingestion.config import (
     WORKER_STAGGER_MIN, WORKER_STAGGER_MAX
 )
@@ -48,6 +48,10 @@ def run_worker_with_stagger(worker_func: Callable, name: str, *args, **kwargs):
     except Exception as e:
         worker_logger.error(f"Error en {name}: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        # Los procesos de multiprocessing terminan con os._exit y no ejecutan
+        # atexit: los logs de BD pendientes se vuelcan aquí
+        stop_db_logging()
 
 def run_parallel_task(
     task_func: Callable, 
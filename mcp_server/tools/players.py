@@ -94,14 +94,6 @@ def register_player_tools(mcp: FastMCP) -> None:
                     serialize_player_game_stats(s) for s in data[period]['games']
                 ]
 
-        # Limpiar campos internos (_total_*) de los registros por temporada
-        for key in ('regular_season', 'playoffs', 'ist'):
-            if data.get(key):
-                data[key] = [
-                    {k: v for k, v in record.items() if not k.startswith('_')}
-                    for record in data[key]
-                ]
-
         return to_json(round_floats(data))
 
     @mcp.tool()
@@ -4,7 +4,9 @@ Proporciona funciones para detectar outliers en estadísticas de partidos
 usando el modelo de autoencoder entrenado.
 """
 
+import heapq
 import logging
+from operator import itemgetter
 from typing import List, Optional, Tuple, Dict, Any
 from pathlib import Path
 
@@ -351,5 +353,5 @@ def _get_top_features(contributions: Dict[str, float], n: int = 3) -> List[str]:
     """Obtiene las N features que más contribuyen al error."""
     if not contributions:
         return []
-    sorted_features = sorted(contributions.items(), key=lambda x: x[1], reverse=True)
-    return [f[0] for f in sorted_features[:n]]
+    # Top-N sin ordenar todas las features (equivale a sorted(...)[:n])
+    return [f[0] for f in heapq.nlargest(n, contributions.items(), key=itemgetter(1))]
@@ -0,0 +1,108 @@
+"""Tests para el decorador ttl_cache de db/cache.py.
+
+Verifican aciertos, expiración, bypass con sesión explícita, copia
+defensiva de resultados y la clave de versión.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from db.cache import ttl_cache
+
+
+def _make_counter(**cache_kwargs):
+    """Crea una función cacheada que cuenta sus ejecuciones reales."""
+    calls = []
+
+    @ttl_cache(**cache_kwargs)
+    def fn(player_id, session=None):
+        calls.append((player_id, session))
+        return {'player_id': player_id, 'items': [1, 2]}
+
+    return fn, calls
+
+
+class TestTTLCache:
+    """Tests del decorador ttl_cache."""
+
+    def test_repeated_call_hits_cache(self):
+        fn, calls = _make_counter()
+        assert fn(1) == fn(1)
+        assert len(calls) == 1
+
+    def test_different_args_miss(self):
+        fn, calls = _make_counter()
+        fn(1)
+        fn(2)
+        assert len(calls) == 2
+
+    def test_explicit_session_bypasses_cache(self):
+        fn, calls = _make_counter()
+        session = MagicMock()
+        fn(1, session=session)
+        fn(1, session=session)
+        assert len(calls) == 2
+        assert calls[0][1] is session
+
+    def test_result_is_copied(self):
+        """Mutar el resultado no altera la entrada cacheada."""
+        fn, calls = _make_counter()
+        first = fn(1)
+        first['items'].append(3)
+        assert fn(1)['items'] == [1, 2]
+
+    def test_entries_expire(self):
+        fn, calls = _make_counter(ttl=10)
+        with patch('db.cache.time.monotonic', return_value=100.0):
+            fn(1)
+        with patch('db.cache.time.monotonic', return_value=105.0):
+            fn(1)
+        assert len(calls) == 1
+        with patch('db.cache.time.monotonic', return_value=111.0):
+            fn(1)
+        assert len(calls) == 2
+
+    def test_lru_eviction(self):
+        fn, calls = _make_counter(maxsize=2)
+        fn(1)
+        fn(2)
+        fn(1)  # 1 pasa a ser la más reciente
+        fn(3)  # expulsa a 2
+        fn(1)
+        assert len(calls) == 3
+        fn(2)
+        assert len(calls) == 4
+
+    def test_cache_clear(self):
+        fn, calls = _make_counter()
+        fn(1)
+        fn.cache_clear()
+        fn(1)
+        assert len(calls) == 2
+
+    def test_version_is_part_of_key(self):
+        """Un cambio de versión (ej: nuevo partido) invalida la entrada."""
+        version = MagicMock(side_effect=['2024-01-01', '2024-01-01', '2024-01-03'])
+        fn, calls = _make_counter(version=version)
+        session = MagicMock()
+        with patch('db.cache.get_session', return_value=session):
+            fn(1)
+            fn(1)
+            assert len(calls) == 1
+            fn(1)
+            assert len(calls) == 2
+        # La función recibe la misma sesión usada para calcular la versión
+        assert calls[0][1] is session
+        assert session.close.call_count == 3
+
+    def test_version_reuses_bound_session(self):
+        """Con una sesión ligada (session_scope) no se abre ni se cierra otra."""
+        version = MagicMock(return_value='2024-01-01')
+        fn, calls = _make_counter(version=version)
+        session = MagicMock()
+        with patch('db.cache.current_session', return_value=session), \
+             patch('db.cache.get_session') as get_session:
+            fn(1)
+        get_session.assert_not_called()
+        assert calls[0][1] is session
+        session.close.assert_not_called()
@@ -0,0 +1,78 @@
+"""Tests para el handler de logs en BD de db/logging.py.
+
+Verifican el volcado por lotes, el plazo máximo de un lote incompleto y el
+volcado explícito de los registros pendientes al parar el listener.
+"""
+
+import logging
+import queue
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import db.logging as db_logging
+from db.logging import SQLAlchemyHandler, _BatchingQueueListener
+
+
+def _record(message):
+    return logging.LogRecord('dateados.test', logging.INFO, __file__, 1, message, None, None)
+
+
+@pytest.fixture
+def engine():
+    """Engine falso: guarda las filas de cada INSERT ejecutado."""
+    batches = []
+    conn = MagicMock()
+    conn.execute.side_effect = lambda stmt, rows: batches.append([r['message'] for r in rows])
+    engine = MagicMock()
+    engine.begin.return_value.__enter__.return_value = conn
+    with patch('db.logging.get_engine', return_value=engine):
+        yield batches
+
+
+class TestSQLAlchemyHandler:
+    """Tests del handler por lotes."""
+
+    def test_full_batch_is_written(self, engine):
+        handler = SQLAlchemyHandler()
+        with patch('db.logging.LOG_DB_BATCH_SIZE', 3):
+            for i in range(4):
+                handler.handle(_record(f'm{i}'))
+        assert engine == [['m0', 'm1', 'm2']]
+        handler.close()
+        assert engine == [['m0', 'm1', 'm2'], ['m3']]
+
+    def test_failed_batch_is_reported(self, engine):
+        handler = SQLAlchemyHandler()
+        handler.handleError = MagicMock()
+        with patch('db.logging.get_engine', side_effect=RuntimeError('sin BD')):
+            handler.handle(_record('m0'))
+            handler.flush()
+        handler.handleError.assert_called_once()
+
+
+class TestBatchingQueueListener:
+    """Tests del listener que vuelca los lotes al vencer su plazo."""
+
+    def test_overdue_batch_flushed_while_queue_is_busy(self, engine):
+        """Un goteo constante de registros no retrasa el volcado del lote."""
+        handler = SQLAlchemyHandler()
+        listener = _BatchingQueueListener(queue.Queue(), handler)
+        with patch('db.logging.time.monotonic', return_value=100.0):
+            handler.handle(_record('m0'))
+        listener.queue.put_nowait(_record('m1'))
+        with patch('db.logging.time.monotonic', return_value=100.0 + db_logging.LOG_DB_FLUSH_INTERVAL):
+            next_record = listener.dequeue(True)
+        assert engine == [['m0']]
+        assert next_record.getMessage() == 'm1'
+
+    def test_stop_db_logging_flushes_pending_records(self, engine):
+        """Los workers (os._exit, sin atexit) vuelcan lo pendiente al parar el listener."""
+        handler = SQLAlchemyHandler()
+        listener = _BatchingQueueListener(queue.Queue(), handler)
+        listener.start()
+        listener.queue.put_nowait(_record('m0'))
+        with patch.object(db_logging, '_db_listener', listener), \
+             patch.object(db_logging, '_db_listener_pid', db_logging.os.getpid()):
+            db_logging.stop_db_logging()
+        assert engine == [['m0']]
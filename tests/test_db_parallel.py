@@ -0,0 +1,22 @@
+"""Tests para run_parallel de db/query.py."""
+
+import threading
+
+from db.query import run_parallel
+
+
+class TestRunParallel:
+    """Tests de la ejecución concurrente de consultas independientes."""
+
+    def test_results_keyed_by_call(self):
+        result = run_parallel({'a': lambda: 1, 'b': lambda: [2, 3]})
+        assert result == {'a': 1, 'b': [2, 3]}
+
+    def test_empty_calls(self):
+        assert run_parallel({}) == {}
+
+    def test_calls_overlap(self):
+        """Las llamadas se ejecutan a la vez: una barrera de 3 no se bloquea."""
+        barrier = threading.Barrier(3, timeout=5)
+        result = run_parallel({k: barrier.wait for k in 'xyz'})
+        assert sorted(result.values()) == [0, 1, 2]
@@ -0,0 +1,81 @@
+"""Tests de consultas de db/query.py sobre una BD SQLite en memoria.
+
+Verifican que las sentencias precompiladas son neutrales respecto al dialecto
+(los tests no usan PostgreSQL).
+"""
+
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.models import Base, Game, Player, PlayerGameStats, PlayerTeamSeason, Team
+
+
+@pytest.fixture
+def test_db():
+    """Crea una base de datos SQLite en memoria con dos equipos."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.add_all([
+        Team(id=1, full_name="Lakers", abbreviation="LAL"),
+        Team(id=2, full_name="Warriors", abbreviation="GSW"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _add_game(session, game_id, game_date, season, player_id, pts):
+    """Añade un partido con la línea de estadísticas de un jugador."""
+    session.add(Game(id=game_id, date=game_date, season=season, home_team_id=1, away_team_id=2))
+    session.add(PlayerGameStats(
+        game_id=game_id, player_id=player_id, team_id=1, pts=pts,
+        min=timedelta(minutes=30), reb=5, ast=5, stl=1, blk=1, tov=2, pf=2,
+        fgm=8, fga=15, fg3m=2, fg3a=5, ftm=2, fta=2, plus_minus=3
+    ))
+
+
+class TestCareerHighsBulk:
+    """Tests de get_career_highs_bulk()."""
+
+    def test_tied_record_returns_latest_game(self, test_db):
+        """Con el récord repetido en varios partidos se devuelve solo el más reciente."""
+        from db.query import get_career_highs_bulk
+
+        test_db.add(Player(id=2544, full_name="LeBron James"))
+        _add_game(test_db, "0022200001", date(2023, 3, 1), "2022-23", 2544, pts=40)
+        _add_game(test_db, "0022300001", date(2023, 11, 1), "2023-24", 2544, pts=40)
+        test_db.commit()
+
+        highs = get_career_highs_bulk([2544], session=test_db)[2544]
+        assert highs['pts']['value'] == 40
+        assert highs['pts']['game_id'] == "0022300001"
+        assert highs['total_games'] == 2
+
+
+class TestTeamRoster:
+    """Tests de get_team_roster()."""
+
+    def test_player_with_regular_season_and_playoffs_listed_once(self, test_db):
+        """Un jugador con filas de Regular Season y Playoffs aparece una vez (la de RS)."""
+        from db.query import get_team_roster
+
+        test_db.add_all([
+            Player(id=2544, full_name="LeBron James"),
+            Player(id=201566, full_name="Anthony Davis"),
+            PlayerTeamSeason(player_id=2544, team_id=1, season="2023-24",
+                             type="Regular Season", games_played=71, pts=1822),
+            PlayerTeamSeason(player_id=2544, team_id=1, season="2023-24",
+                             type="Playoffs", games_played=5, pts=139),
+            PlayerTeamSeason(player_id=201566, team_id=1, season="2023-24",
+                             type="Playoffs", games_played=5, pts=136),
+        ])
+        test_db.commit()
+
+        roster = get_team_roster(1, "2023-24", session=test_db)
+        assert roster['count'] == 2
+        assert [p['full_name'] for p in roster['players']] == ["Anthony Davis", "LeBron James"]
+        assert roster['players'][1]['games_played'] == 71
@@ -0,0 +1,67 @@
+"""Tests para la regeneración de tablas derivadas (ingestion/derived_tables.py).
+
+Usan una BD SQLite en memoria; los récords de carrera se escriben con el mismo
+upsert que en PostgreSQL. Las tablas por temporada (suma de intervalos, solo
+PostgreSQL) se omiten.
+"""
+
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.models import Base, Game, Player, PlayerCareerHigh, PlayerGameStats, Team
+from ingestion.derived_tables import DerivedTablesGenerator
+
+
+@pytest.fixture
+def test_db():
+    """BD SQLite en memoria con un jugador que juega dos temporadas consecutivas."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.add_all([
+        Team(id=1, full_name="Lakers", abbreviation="LAL"),
+        Team(id=2, full_name="Warriors", abbreviation="GSW"),
+        Player(id=2544, full_name="LeBron James"),
+    ])
+    for game_id, game_date, season, pts in [
+        ("0022200001", date(2023, 3, 1), "2022-23", 38),
+        ("0022300001", date(2023, 11, 1), "2023-24", 41),
+    ]:
+        session.add(Game(id=game_id, date=game_date, season=season, home_team_id=1,
+                         away_team_id=2, home_score=120, away_score=110, winner_team_id=1, rs=True))
+        session.add(PlayerGameStats(
+            game_id=game_id, player_id=2544, team_id=1, pts=pts,
+            min=timedelta(minutes=35), reb=8, ast=9, stl=1, blk=1, tov=3, pf=2,
+            fgm=14, fga=25, fg3m=3, fg3a=7, ftm=7, fta=8, plus_minus=6
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestCareerHighsRegeneration:
+    """Tests de la regeneración de PlayerCareerHigh."""
+
+    def test_overlapping_seasons_one_row_per_player(self, test_db):
+        """Dos temporadas con el mismo jugador: una fila y un solo cálculo de su carrera."""
+        from ingestion import derived_tables
+
+        generator = DerivedTablesGenerator()
+        with patch.object(DerivedTablesGenerator, '_regenerate_season'), \
+             patch.object(derived_tables, 'get_career_highs_bulk',
+                          wraps=derived_tables.get_career_highs_bulk) as bulk:
+            generator.regenerate_for_seasons(test_db, ["2022-23", "2023-24"])
+            # Una segunda pasada actualiza la fila existente en lugar de duplicarla
+            generator.regenerate_for_seasons(test_db, ["2023-24"])
+
+        assert bulk.call_count == 2
+        rows = test_db.query(PlayerCareerHigh).all()
+        assert len(rows) == 1
+        assert rows[0].player_id == 2544
+        assert rows[0].pts == 41
+        assert rows[0].pts_game_id == "0022300001"
+        assert rows[0].total_games == 2
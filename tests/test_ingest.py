@@ -111,3 +111,71 @@ class TestIsValidTeamId:
             # Sin allow_special_events, deberia fallar
             result = is_valid_team_id(team_id, allow_special_events=False)
             assert result is False
+
+
+class TestGetOrCreateCache:
+    """Tests para get_or_create_player() con cache precargado."""
+    
+    def test_cached_player_skips_query(self):
+        """Un ID presente en el cache no consulta la BD."""
+        from db.services import get_or_create_player
+        
+        session = MagicMock()
+        player = MagicMock(id=2544)
+        cache = {2544: player}
+        
+        assert get_or_create_player(session, 2544, {'full_name': 'LeBron James'}, cache=cache) is player
+        session.query.assert_not_called()
+    
+    def test_created_player_added_to_cache(self):
+        """Un jugador ausente del lote se crea y se añade al cache."""
+        from db.services import get_or_create_player
+        
+        session = MagicMock()
+        cache = {}
+        
+        player = get_or_create_player(session, 1, {'full_name': 'Nuevo Jugador'}, cache=cache)
+        session.query.assert_not_called()
+        assert cache[1] is player
+        assert player.full_name == 'Nuevo Jugador'
+    
+    def test_bulk_fallback_creates_missing_players(self):
+        """Fuera de PostgreSQL el lote se resuelve con una sola consulta previa."""
+        from db.services import bulk_get_or_create_players
+        
+        session = MagicMock()
+        session.query.return_value.filter.return_value.all.return_value = []
+        
+        players = bulk_get_or_create_players(session, {1: {'full_name': 'A'}, 2: {'full_name': 'B'}})
+        assert session.query.call_count == 1
+        assert {pid: p.full_name for pid, p in players.items()} == {1: 'A', 2: 'B'}
+    
+    def test_bulk_fallback_keeps_existing_name(self):
+        """Un jugador existente solo actualiza posición y dorsal, no el nombre."""
+        from db.services import bulk_get_or_create_players
+        
+        session = MagicMock()
+        existing = MagicMock(id=2544, full_name='LeBron James', position='F', jersey='23')
+        session.query.return_value.filter.return_value.all.return_value = [existing]
+        
+        players = bulk_get_or_create_players(session, {2544: {'full_name': 'Player 2544', 'jersey': '6'}})
+        assert players[2544] is existing
+        assert (existing.full_name, existing.position, existing.jersey) == ('LeBron James', 'F', '6')
+    
+    def test_bulk_postgresql_upsert_does_not_update_name(self):
+        """En PostgreSQL el ON CONFLICT solo actualiza posición y dorsal."""
+        from sqlalchemy.dialects import postgresql
+        from db.services import bulk_get_or_create_players
+        
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = 'postgresql'
+        session.scalars.return_value = []
+        
+        bulk_get_or_create_players(session, {1: {'full_name': 'A'}, 2: {}})
+        session.scalars.assert_called_once()
+        sql = str(session.scalars.call_args[0][0].compile(dialect=postgresql.dialect()))
+        insert_part, update_part = sql.split('DO UPDATE SET')
+        update_part = update_part.split('RETURNING')[0]
+        assert 'ON CONFLICT (id)' in insert_part
+        assert 'position' in update_part and 'jersey' in update_part
+        assert 'full_name' not in update_part
@@ -440,3 +440,12 @@ class TestPlayerRankingsCriteria:
         assert 'fastest' not in valid
         assert 'best' not in valid
         assert '' not in valid
+
+    def test_dispatch_table_covers_valid_criteria(self):
+        """La tabla de criterios de db.query coincide con los criterios documentados."""
+        from db.query import _RANKING_CRITERIA
+        assert set(_RANKING_CRITERIA) == {
+            'youngest', 'oldest', 'heaviest', 'lightest',
+            'tallest', 'shortest', 'most_experienced',
+            'highest_draft_pick', 'lowest_draft_pick'
+        }
@@ -5,7 +5,7 @@ from pathlib import Path
 import logging
 import sys
 from db.logging import setup_logging
-from db.connection import init_db
+from db.connection import init_db, session_scope
 
 # Asegurar que las tablas existen antes de configurar logging
 try:
@@ -22,6 +22,17 @@ app = FastAPI(title="NBA Stats Web")
 from fastapi.middleware.gzip import GZipMiddleware
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    """Liga una sesión de BD por petición: rutas y consultas sin `session` la comparten.
+    
+    La sesión es perezosa (no toma conexión del pool hasta la primera consulta),
+    así que las peticiones de estáticos no tocan la base de datos.
+    """
+    with session_scope():
+        return await call_next(request)
+
 # Configurar rutas de archivos estaticos y templates
 from web.templates import templates
 BASE_DIR = Path(__file__).resolve().parent
@@ -13,7 +13,7 @@ import time
 import asyncio
 import httpx
 
-from db.connection import get_session, get_engine
+from db.connection import get_session, get_engine, current_session
 from db.models import SystemStatus, Base, LogEntry
 from ingestion.utils import ProgressReporter
 from db.logging import cleanup_for_new_ingestion
@@ -25,6 +25,11 @@ router = APIRouter(prefix="/admin")
 active_processes = []
 
 def get_db():
+    # Sesión de la petición (middleware de web/app.py); sin ella, una propia
+    db = current_session()
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
         yield db
@@ -6,13 +6,18 @@ from math import ceil
 from datetime import date as date_obj
 from typing import Optional
 
-from db.connection import get_session
+from db.connection import get_session, current_session
 from db import get_games, get_game_details
 from db.models import Game
 
 router = APIRouter()
 
 def get_db():
+    # Sesión de la petición (middleware de web/app.py); sin ella, una propia
+    db = current_session()
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
         yield db
@@ -145,9 +150,10 @@ async def game_detail(request: Request, game_id: str, db: Session = Depends(get_
     home_player_stats = [s for s in details['player_stats'] if s['team_id'] == home_team_id]
     away_player_stats = [s for s in details['player_stats'] if s['team_id'] == away_team_id]
     
-    # Extraer totales
-    home_totals = next((t for t in details['team_stats'] if t['team_id'] == home_team_id), None)
-    away_totals = next((t for t in details['team_stats'] if t['team_id'] == away_team_id), None)
+    # Extraer totales (un solo recorrido indexado por equipo)
+    totals_by_team = {t['team_id']: t for t in details['team_stats']}
+    home_totals = totals_by_team.get(home_team_id)
+    away_totals = totals_by_team.get(away_team_id)
     
     return templates.TemplateResponse("games/detail.html", {
         "request": request,
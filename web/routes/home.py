@@ -3,13 +3,18 @@ from web.templates import templates
 from sqlalchemy.orm import Session
 from pathlib import Path
 
-from db.connection import get_session
+from db.connection import get_session, current_session
 from db import get_database_stats, get_games
 
 router = APIRouter()
 
 # Dependencia para obtener la sesion de BD
 def get_db():
+    # Sesión de la petición (middleware de web/app.py); sin ella, una propia
+    db = current_session()
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
         yield db
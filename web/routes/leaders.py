@@ -4,13 +4,18 @@ from sqlalchemy.orm import Session
 from pathlib import Path
 from typing import Optional
 
-from db.connection import get_session
+from db.connection import get_session, current_session
 from db import get_top_players, get_games
 from db.models import Game
 
 router = APIRouter()
 
 def get_db():
+    # Sesión de la petición (middleware de web/app.py); sin ella, una propia
+    db = current_session()
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
         yield db
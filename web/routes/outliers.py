@@ -18,7 +18,7 @@ from typing import Optional, List
 from datetime import date, timedelta
 from math import ceil
 
-from db.connection import get_session
+from db.connection import get_session, current_session
 from db.models import Game, Player, PlayerGameStats
 from outliers.models import LeagueOutlier, PlayerOutlier, PlayerTrendOutlier
 
@@ -93,6 +93,11 @@ router = APIRouter(prefix="/outliers", tags=["outliers"])
 
 
 def get_db():
+    # Sesión de la petición (middleware de web/app.py); sin ella, una propia
+    db = current_session()
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
         yield db
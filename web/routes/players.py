@@ -4,9 +4,10 @@ from sqlalchemy.orm import Session
 from pathlib import Path
 from math import ceil
 from datetime import date
+from functools import partial
 from typing import Optional
 
-from db.connection import get_session
+from db.connection import get_session, current_session
 from db import (
     get_players, 
     get_player_stats, 
@@ -15,13 +16,19 @@ from db import (
     get_historical_teammates,
     get_player_career_stats,
     get_player_career_highs,
-    get_player_awards
+    get_player_awards,
+    run_parallel
 )
 from db.models import Player
 
 router = APIRouter(prefix="/players")
 
 def get_db():
+    # Sesión de la petición (middleware de web/app.py); sin ella, una propia
+    db = current_session()
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
         yield db
@@ -132,25 +139,26 @@ async def player_detail(request: Request, player_id: int, db: Session = Depends(
     # Obtener ultimos partidos
     recent_stats = get_player_stats(player_id=player_id, limit=10, session=db)
     
-    # Obtener promedios de la ultima temporada disponible
-    ultima_temporada = None
-    promedios = None
-    if team_seasons:
-        ultima_temporada = team_seasons[0]['season']
-        promedios = get_player_season_averages(player_id, ultima_temporada, session=db)
-    
-    # Obtener compañeros actuales
-    current_teammates = get_current_teammates(player_id, session=db)
-    
-    # Obtener estadísticas de carrera por temporada
+    # Consultas independientes que devuelven dicts: en paralelo, cada una con su
+    # propia conexión del pool (promedios de la última temporada, compañeros
+    # actuales, récords personales y premios)
+    ultima_temporada = team_seasons[0]['season'] if team_seasons else None
+    calls = {
+        'current_teammates': partial(get_current_teammates, player_id),
+        'career_highs': partial(get_player_career_highs, player_id),
+        'awards': partial(get_player_awards, player_id),
+    }
+    if ultima_temporada:
+        calls['promedios'] = partial(get_player_season_averages, player_id, ultima_temporada)
+    parallel = run_parallel(calls)
+    promedios = parallel.get('promedios')
+    current_teammates = parallel['current_teammates']
+    career_highs = parallel['career_highs']
+    awards = parallel['awards']
+    
+    # Obtener estadísticas de carrera por temporada (reutiliza las temporadas ya cargadas en la sesión)
     career_stats = get_player_career_stats(player_id, session=db)
     
-    # Obtener récords personales
-    career_highs = get_player_career_highs(player_id, session=db)
-    
-    # Obtener premios y logros (Persistentes en BD)
-    awards = get_player_awards(player_id, session=db)
-    
     return templates.TemplateResponse("players/detail.html", {
         "request": request,
         "active_page": "players",
@@ -3,16 +3,22 @@ from fastapi.responses import RedirectResponse
 from web.templates import templates
 from sqlalchemy.orm import Session, joinedload
 from pathlib import Path
+from operator import itemgetter
 from sqlalchemy import func, asc, and_, or_, desc
 from typing import Optional
 
-from db.connection import get_session
+from db.connection import get_session, current_session
 from db import get_games
 from db.models import Game, Team
 
 router = APIRouter(prefix="/seasons")
 
 def get_db():
+    # Sesión de la petición (middleware de web/app.py); sin ella, una propia
+    db = current_session()
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
         yield db
@@ -99,7 +105,8 @@ async def season_detail(request: Request, season: str, db: Session = Depends(get
     
     # Enrich with team info
     standings = []
-    teams_map = {t.id: t for t in db.query(Team).all()}
+    # Solo los equipos con partidos en la temporada (no la tabla completa)
+    teams_map = {t.id: t for t in db.query(Team).filter(Team.id.in_(standings_dict)).all()} if standings_dict else {}
     for team_id, record in standings_dict.items():
         team = teams_map.get(team_id)
         if not team: continue
@@ -111,8 +118,8 @@ async def season_detail(request: Request, season: str, db: Session = Depends(get
             'conf': team.conference, 'div': team.division
         })
     
-    east_standings = sorted([s for s in standings if s['conf'] == 'East'], key=lambda x: x['pct'], reverse=True)
-    west_standings = sorted([s for s in standings if s['conf'] == 'West'], key=lambda x: x['pct'], reverse=True)
+    east_standings = sorted([s for s in standings if s['conf'] == 'East'], key=itemgetter('pct'), reverse=True)
+    west_standings = sorted([s for s in standings if s['conf'] == 'West'], key=itemgetter('pct'), reverse=True)
     
     # --- PLAYOFF BRACKET LOGIC ---
     def get_bracket_data(games_list, is_ist=False):
@@ -14,7 +14,7 @@ from typing import Optional, List, Dict
 from datetime import timedelta
 from math import ceil
 
-from db.connection import get_session
+from db.connection import get_session, current_session
 from db.models import Game, Player
 from outliers.stats.streaks import StreakCriteria
 from outliers.models import StreakRecord, StreakAllTimeRecord
@@ -23,6 +23,11 @@ router = APIRouter(prefix="/streaks", tags=["streaks"])
 
 
 def get_db():
+    # Sesión de la petición (middleware de web/app.py); sin ella, una propia
+    db = current_session()
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
         yield db
@@ -5,13 +5,18 @@ from pathlib import Path
 from sqlalchemy import desc
 from typing import Optional
 
-from db.connection import get_session
+from db.connection import get_session, current_session
 from db import get_teams, get_team_record, get_games
 from db.models import Team, PlayerTeamSeason, Player, Game
 
 router = APIRouter(prefix="/teams")
 
 def get_db():
+    # Sesión de la petición (middleware de web/app.py); sin ella, una propia
+    db = current_session()
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
         yield db